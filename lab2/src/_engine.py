@@ -0,0 +1,486 @@
+"""Движок таблиц истинности и построители форм lab2.
+
+Загружается из src.core при первом обращении к любому из этих имён.
+"""
+import base64
+import decimal
+import io
+from functools import cached_property
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union, TextIO
+
+from src.config import OPERATORS_SET, OPERATOR_PRIORITY
+
+def construct_cnf(table: List[List[int]], vars: List[str]) -> str:
+    """Строит конъюнктивную нормальную форму (КНФ) из таблицы истинности."""
+    return render_form(table, vars, 'cnf')
+
+def construct_dnf(table: List[List[int]], vars: List[str]) -> str:
+    """Строит дизъюнктивную нормальную форму (ДНФ) из таблицы истинности."""
+    return render_form(table, vars, 'dnf')
+
+def cnf_binary_form(table: List[List[int]], vars: List[str]) -> str:
+    """Генерирует бинарное представление КНФ."""
+    return render_form(table, vars, 'cnf_binary')
+
+def cnf_decimal_form(table: List[List[int]], vars: List[str]) -> str:
+    """Генерирует десятичное представление КНФ."""
+    return render_form(table, vars, 'cnf_decimal')
+
+def dnf_binary_form(table: List[List[int]], vars: List[str]) -> str:
+    """Генерирует бинарное представление ДНФ."""
+    return render_form(table, vars, 'dnf_binary')
+
+def dnf_decimal_form(table: List[List[int]], vars: List[str]) -> str:
+    """Генерирует десятичное представление ДНФ."""
+    return render_form(table, vars, 'dnf_decimal')
+
+def get_binary_index(table: List[List[int]]) -> str:
+    """Генерирует бинарный индекс из результатов таблицы истинности."""
+    if isinstance(table, TruthTable):
+        return format(function_index(table), f'0{len(table)}b')
+    return render_form(table, [], 'index')
+
+def convert_to_decimal(binary: str) -> str:
+    """Преобразует бинарную строку в десятичное число."""
+    return ''.join(iter_decimal(int(binary, 2))) if binary else '0'
+
+BINARY_OPERATORS = frozenset(OPERATORS_SET - {'!', '(', ')'})
+
+class TruthTable:
+    """Таблица истинности с результатами, упакованными в целое число.
+
+    Бит i числа bits хранит результат строки i, первая переменная — старший
+    бит номера строки. Строки выдаются как списки [x1, ..., xn, результат],
+    поэтому таблица совместима с функциями, ожидающими список списков.
+    """
+
+    def __init__(self, bits: int, num_vars: int):
+        self.bits = bits
+        self.num_vars = num_vars
+
+    @cached_property
+    def data(self) -> bytes:
+        """Результаты в виде байтов (little-endian) для быстрого построчного доступа."""
+        return self.bits.to_bytes(((1 << self.num_vars) + 7) >> 3, 'little')
+
+    def result(self, index: int) -> int:
+        return (self.data[index >> 3] >> (index & 7)) & 1
+
+    def row(self, index: int) -> List[int]:
+        n = self.num_vars
+        return [(index >> (n - 1 - j)) & 1 for j in range(n)] + [self.result(index)]
+
+    def __len__(self) -> int:
+        return 1 << self.num_vars
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер строки вне таблицы")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return (self.row(i) for i in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TruthTable):
+            return self.num_vars == other.num_vars and self.bits == other.bits
+        try:
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TruthTable(bits={self.bits:#x}, num_vars={self.num_vars})"
+
+def extract_variables(formula: str) -> List[str]:
+    """Возвращает отсортированный список переменных формулы."""
+    return sorted(set(ch for ch in formula if ch.isalpha()))
+
+def infix_to_postfix(formula: str) -> str:
+    """Переводит формулу в обратную польскую запись (алгоритм сортировочной станции).
+
+    Отрицание — префиксная операция и связывает сильнее любой бинарной,
+    импликация «>» (или «->») правоассоциативна.
+    """
+    output = []
+    stack = []
+    for ch in formula.replace('->', '>'):
+        if ch.isspace():
+            continue
+        if ch.isalpha():
+            output.append(ch)
+        elif ch in ('!', '('):
+            stack.append(ch)
+        elif ch == ')':
+            while stack and stack[-1] != '(':
+                output.append(stack.pop())
+            if not stack:
+                raise ValueError("Несогласованные скобки в формуле!")
+            stack.pop()
+        elif ch in BINARY_OPERATORS:
+            priority = OPERATOR_PRIORITY[ch]
+            while stack and stack[-1] != '(' and (
+                    stack[-1] == '!' or OPERATOR_PRIORITY[stack[-1]] > priority
+                    or OPERATOR_PRIORITY[stack[-1]] == priority and ch != '>'):
+                output.append(stack.pop())
+            stack.append(ch)
+        else:
+            raise ValueError(f"Недопустимый символ в формуле: {ch}")
+    while stack:
+        op = stack.pop()
+        if op == '(':
+            raise ValueError("Несогласованные скобки в формуле!")
+        output.append(op)
+    return ''.join(output)
+
+def apply_operators(postfix: str, operands: dict, one: int) -> int:
+    """Вычисляет постфиксную запись над целыми числами как над наборами битов.
+
+    one — значение «истина»: 1 для одной строки или маска всех строк
+    для упакованных столбцов таблицы.
+    """
+    stack = []
+    for ch in postfix:
+        if ch in BINARY_OPERATORS and len(stack) < 2 or ch == '!' and not stack:
+            raise ValueError(f"Не хватает операндов для операции {ch}")
+        if ch == '!':
+            stack.append(one ^ stack.pop())
+        elif ch in BINARY_OPERATORS:
+            right = stack.pop()
+            left = stack.pop()
+            if ch == '&':
+                stack.append(left & right)
+            elif ch == '|':
+                stack.append(left | right)
+            elif ch == '~':
+                stack.append(one ^ left ^ right)
+            else:
+                stack.append((one ^ left) | right)
+        elif ch in operands:
+            stack.append(operands[ch])
+        else:
+            raise ValueError(f"Неизвестный символ в записи: {ch}")
+    if len(stack) != 1:
+        raise ValueError("Некорректная формула!")
+    return stack[0]
+
+def compute_postfix(values: List[int], postfix: str, vars: List[str]) -> int:
+    """Вычисляет значение постфиксной записи на одном наборе значений переменных."""
+    return apply_operators(postfix, dict(zip(vars, values)), 1)
+
+def variable_column(position: int, num_vars: int) -> int:
+    """Упакованный столбец переменной: бит i — её значение в строке i таблицы."""
+    block = 1 << (num_vars - position - 1)
+    column = ((1 << block) - 1) << block
+    width = block << 1
+    while width < 1 << num_vars:
+        column |= column << width
+        width <<= 1
+    return column
+
+def display_header(vars: List[str]) -> None:
+    """Выводит заголовок таблицы истинности."""
+    print(' | '.join(vars + ['Результат']))
+
+def create_truth_table(formula: str, show: bool = False) -> Tuple[TruthTable, List[str]]:
+    """Строит таблицу истинности формулы.
+
+    Каждая операция выполняется один раз над упакованными столбцами всех
+    строк сразу, поэтому таблица на 20 переменных строится за доли секунды.
+    """
+    vars = extract_variables(formula)
+    postfix = infix_to_postfix(formula)
+    num_vars = len(vars)
+    columns = {var: variable_column(j, num_vars) for j, var in enumerate(vars)}
+    one = (1 << (1 << num_vars)) - 1
+    table = TruthTable(apply_operators(postfix, columns, one) & one, num_vars)
+    if show:
+        display_header(vars)
+        for row in table:
+            print(' | '.join(map(str, row)))
+    return table, vars
+
+# Имена форм, которые умеет выводить emit_normal_forms, в порядке вывода present_results
+FORM_NAMES = ('cnf', 'dnf', 'cnf_binary', 'cnf_decimal', 'dnf_binary', 'dnf_decimal', 'index')
+
+# Сколько термов копится в памяти перед записью в поток
+FLUSH_TERMS = 4096
+
+class _FormSink:
+    """Пишет термы одной формы в поток через разделитель, порциями по FLUSH_TERMS."""
+
+    def __init__(self, stream: TextIO, opening: str, separator: str, closing: str):
+        self.stream = stream
+        self.separator = separator
+        self.closing = closing
+        self.parts = [opening]
+        self.first = True
+
+    def add(self, term: str) -> None:
+        if self.first:
+            self.first = False
+        else:
+            self.parts.append(self.separator)
+        self.parts.append(term)
+        if len(self.parts) >= FLUSH_TERMS:
+            self.flush()
+
+    def flush(self) -> None:
+        self.stream.write(''.join(self.parts))
+        self.parts = []
+
+    def close(self) -> None:
+        self.parts.append(self.closing)
+        self.flush()
+
+def table_results(table: Iterable[List[int]]) -> Iterator[int]:
+    """Результаты строк таблицы по порядку, без сборки самих строк для TruthTable."""
+    if isinstance(table, TruthTable):
+        data = table.data
+        return (data[i >> 3] >> (i & 7) & 1 for i in range(len(table)))
+    return (row[-1] for row in table)
+
+def clause_builder(vars: List[str], joiner: str, negated_bit: int) -> Callable[[int], str]:
+    """Функция, строящая скобку СКНФ/СДНФ по номеру строки.
+
+    Литералы старшей и младшей половин переменных заранее собраны для
+    всех их значений, так что скобка склеивается из двух готовых строк.
+    """
+    n = len(vars)
+    low_count = n // 2
+
+    def halves(names: List[str]) -> List[str]:
+        width = len(names)
+        return [joiner.join(('!' if (value >> (width - 1 - j)) & 1 == negated_bit else '') + name
+                            for j, name in enumerate(names))
+                for value in range(1 << width)]
+
+    high = halves(vars[:n - low_count])
+    if not low_count:
+        return lambda index: '(' + high[index] + ')'
+    low = halves(vars[n - low_count:])
+    mask = (1 << low_count) - 1
+    return lambda index: '(' + high[index >> low_count] + joiner + low[index & mask] + ')'
+
+def emit_normal_forms(table: Iterable[List[int]], vars: List[str], writers: Dict[str, TextIO]) -> None:
+    """Записывает формы из FORM_NAMES за один проход по таблице.
+
+    writers сопоставляет имени формы поток с методом write (файл, StringIO,
+    sys.stdout); формы без потока не строятся. Номер строки сразу служит
+    десятичной записью набора, двоичная получается через format.
+    """
+    unknown = set(writers) - set(FORM_NAMES)
+    if unknown:
+        raise ValueError(f"Неизвестные формы: {', '.join(sorted(unknown))}")
+    n = len(vars)
+    sinks = {}
+    for name, opening, separator, closing in (
+            ('cnf', '', '&', ''), ('dnf', '', '|', ''),
+            ('cnf_binary', '&(', ',', ')'), ('cnf_decimal', '&(', ',', ')'),
+            ('dnf_binary', '|(', ',', ')'), ('dnf_decimal', '|(', ',', ')'),
+            ('index', '', '', '')):
+        if name in writers:
+            sinks[name] = _FormSink(writers[name], opening, separator, closing)
+    cnf = sinks.get('cnf')
+    dnf = sinks.get('dnf')
+    cnf_binary = sinks.get('cnf_binary')
+    cnf_decimal = sinks.get('cnf_decimal')
+    dnf_binary = sinks.get('dnf_binary')
+    dnf_decimal = sinks.get('dnf_decimal')
+    index_sink = sinks.get('index')
+    cnf_clause = clause_builder(vars, '|', 1) if cnf else None
+    dnf_clause = clause_builder(vars, '&', 0) if dnf else None
+    binary_format = f'0{n}b'
+
+    for index, result in enumerate(table_results(table)):
+        if result:
+            if dnf:
+                dnf.add(dnf_clause(index))
+            if dnf_binary:
+                dnf_binary.add(format(index, binary_format))
+            if dnf_decimal:
+                dnf_decimal.add(str(index))
+        else:
+            if cnf:
+                cnf.add(cnf_clause(index))
+            if cnf_binary:
+                cnf_binary.add(format(index, binary_format))
+            if cnf_decimal:
+                cnf_decimal.add(str(index))
+        if index_sink:
+            index_sink.add('1' if result else '0')
+    for sink in sinks.values():
+        sink.close()
+
+def render_form(table: Iterable[List[int]], vars: List[str], name: str) -> str:
+    """Одна форма из FORM_NAMES в виде строки."""
+    buffer = io.StringIO()
+    emit_normal_forms(table, vars, {name: buffer})
+    return buffer.getvalue()
+
+# Число десятичных цифр в одном куске iter_decimal, меньше предела int_max_str_digits
+DECIMAL_CHUNK = 1000
+
+_REVERSED_BITS = bytes(int(format(b, '08b')[::-1], 2) for b in range(256))
+
+def _index_layout(num_vars: int) -> Tuple[int, int]:
+    """Число байтов индекса и число дополняющих нулевых битов в конце."""
+    rows = 1 << num_vars
+    size = (rows + 7) >> 3
+    return size, size * 8 - rows
+
+def function_index(table: TruthTable) -> int:
+    """Индекс (номер) функции: результат строки 0 — старший бит.
+
+    Совпадает с int(get_binary_index(table), 2), но строится из упакованных
+    байтов таблицы переворотом битов в каждом байте, без строк.
+    """
+    _, pad = _index_layout(table.num_vars)
+    return int.from_bytes(table.data.translate(_REVERSED_BITS), 'big') >> pad
+
+def table_from_index(index: int, num_vars: int) -> TruthTable:
+    """Восстанавливает таблицу истинности функции по её индексу."""
+    if index < 0 or index >> (1 << num_vars):
+        raise ValueError(f"Индекс не помещается в таблицу на {num_vars} переменных")
+    size, pad = _index_layout(num_vars)
+    data = (index << pad).to_bytes(size, 'big').translate(_REVERSED_BITS)
+    return TruthTable(int.from_bytes(data, 'little'), num_vars)
+
+def index_bytes(table: TruthTable) -> bytes:
+    """Индекс в виде байтов big-endian, по одному биту на строку таблицы."""
+    size, pad = _index_layout(table.num_vars)
+    return (function_index(table) << pad).to_bytes(size, 'big')
+
+def index_hex(table: TruthTable) -> str:
+    """Шестнадцатеричная запись индекса, по цифре на каждые 4 строки."""
+    if table.num_vars >= 3:
+        return index_bytes(table).hex()
+    return format(function_index(table), 'x')
+
+def index_base64(table: TruthTable) -> str:
+    """Запись индекса в base64 (байты из index_bytes)."""
+    return base64.b64encode(index_bytes(table)).decode('ascii')
+
+def _to_decimal(number: int) -> decimal.Decimal:
+    """Переводит целое в Decimal делением пополам по битам.
+
+    Умножение больших Decimal в libmpdec быстрее квадратичного, поэтому
+    перевод числа из миллионов цифр занимает секунды.
+    """
+    context = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX)
+    powers = {}
+
+    def power_of_two(width: int) -> decimal.Decimal:
+        if width not in powers:
+            if width <= 256:
+                powers[width] = decimal.Decimal(1 << width)
+            else:
+                half = width >> 1
+                powers[width] = context.multiply(power_of_two(half), power_of_two(width - half))
+        return powers[width]
+
+    def convert(value: int, width: int) -> decimal.Decimal:
+        if width <= 256:
+            return decimal.Decimal(value)
+        half = width >> 1
+        high = value >> half
+        low = value - (high << half)
+        return context.add(context.multiply(convert(high, width - half), power_of_two(half)), convert(low, half))
+
+    return convert(number, number.bit_length())
+
+def _decimal_chunks(value: decimal.Decimal, chunk_digits: int) -> Iterator[str]:
+    """Цифры целого Decimal кусками, от старших к младшим.
+
+    Число делится пополам по степеням 10**(chunk_digits * 2**k): сдвиг
+    порядка (scaleb) и отбрасывание дробной части в Decimal линейны, так
+    что каждый кусок выдаётся сразу, а полная строка не собирается.
+    """
+    context = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    widths = [chunk_digits]
+    while widths[-1] * 2 < value.adjusted() + 1:
+        widths.append(widths[-1] * 2)
+
+    def emit(part: decimal.Decimal, level: int, padded: bool) -> Iterator[str]:
+        if level < 0:
+            text = str(int(part))
+            yield text.zfill(chunk_digits) if padded else text
+            return
+        width = widths[level]
+        high = part.scaleb(-width, context).to_integral_value(decimal.ROUND_DOWN, context)
+        low = context.subtract(part, high.scaleb(width, context))
+        if high or padded:
+            yield from emit(high, level - 1, padded)
+            padded = True
+        yield from emit(low, level - 1, padded)
+
+    yield from emit(value, len(widths) - 1, False)
+
+def iter_decimal(number: int, chunk_digits: int = DECIMAL_CHUNK) -> Iterator[str]:
+    """Десятичная запись неотрицательного числа кусками по chunk_digits цифр.
+
+    str() отказывается переводить числа длиннее sys.get_int_max_str_digits()
+    цифр и работает за квадратичное время. Большое число сначала целиком
+    переводится в Decimal (память — как у самого числа), затем его цифры
+    выдаются кусками от старших к младшим без сборки полной строки.
+    """
+    if number < 0:
+        raise ValueError("Ожидается неотрицательное число")
+    if number.bit_length() <= 3 * chunk_digits:
+        yield str(number)
+        return
+    yield from _decimal_chunks(_to_decimal(number), chunk_digits)
+
+def write_decimal(number: int, stream: TextIO) -> None:
+    """Пишет десятичную запись числа в поток по кускам."""
+    for chunk in iter_decimal(number):
+        stream.write(chunk)
+
+def parse_index(text: str) -> Tuple[int, int]:
+    """Разбирает запись индекса и возвращает (индекс, число переменных).
+
+    Форматы: 0x<hex>, 0b<двоичная>, b64:<base64> и десятичная запись.
+    Длина hex, двоичной и base64 записи задаёт число строк таблицы (так что
+    hex однозначен начиная с 2 переменных, base64 — с 3), для десятичной
+    берётся наименьшее подходящее число переменных.
+    """
+    text = text.strip()
+    try:
+        if text[:2].lower() == '0x':
+            digits = text[2:]
+            number, rows = int(digits, 16), len(digits) * 4
+        elif text[:2].lower() == '0b':
+            digits = text[2:]
+            number, rows = int(digits, 2), len(digits)
+        elif text[:4].lower() == 'b64:':
+            data = base64.b64decode(text[4:], validate=True)
+            number, rows = int.from_bytes(data, 'big'), len(data) * 8
+        else:
+            number = int(text)
+            rows = max(number.bit_length(), 2)
+            rows = 1 << (rows - 1).bit_length()
+    except ValueError as error:
+        raise ValueError(f"Некорректная запись индекса: {text}") from error
+    num_vars = rows.bit_length() - 1
+    if rows < 2 or rows != 1 << num_vars:
+        raise ValueError(f"Длина индекса должна быть степенью двойки строк: {text}")
+    if number < 0:
+        raise ValueError(f"Некорректная запись индекса: {text}")
+    return number, num_vars
+
+def default_variables(num_vars: int) -> List[str]:
+    """Имена переменных a, b, c, ... для функции, заданной индексом."""
+    if num_vars > 26:
+        raise ValueError("Слишком много переменных для однобуквенных имён")
+    return [chr(ord('a') + j) for j in range(num_vars)]
+
+def table_from_index_text(text: str) -> Tuple[TruthTable, List[str]]:
+    """Таблица истинности и переменные функции по записи её индекса."""
+    number, num_vars = parse_index(text)
+    return table_from_index(number, num_vars), default_variables(num_vars)
@@ -0,0 +1,148 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src import core
+
+# Поля записи, которые можно запросить через --forms
+RECORD_FORMS = ('cnf', 'dnf', 'cnf_binary', 'cnf_decimal', 'dnf_binary', 'dnf_decimal',
+                'index', 'index_decimal', 'index_hex')
+
+def read_formulas(stream: TextIO) -> List[Tuple[int, str]]:
+    """Непустые строки потока с их номерами (с 1)."""
+    formulas = []
+    for line_number, line in enumerate(stream, 1):
+        formula = line.strip()
+        if formula:
+            formulas.append((line_number, formula))
+    return formulas
+
+def process_formula(formula: str, forms: Tuple[str, ...], max_vars: int) -> Dict[str, object]:
+    """Запись с переменными и запрошенными формами либо с полем error."""
+    try:
+        if not core.check_formula_validity(formula):
+            raise ValueError("Формула содержит недопустимые символы!")
+        variables = core.extract_variables(formula)
+        if len(variables) > max_vars:
+            raise ValueError(f"Слишком много переменных: {len(variables)} > {max_vars}")
+        table, variables = core.create_truth_table(formula)
+    except ValueError as error:
+        return {'error': str(error)}
+    record = {'variables': variables}
+    writers = {name: io.StringIO() for name in forms if name in core.FORM_NAMES}
+    core.emit_normal_forms(table, variables, writers)
+    for name in forms:
+        if name in writers:
+            record[name] = writers[name].getvalue()
+        elif name == 'index_decimal':
+            record[name] = ''.join(core.iter_decimal(core.function_index(table)))
+        elif name == 'index_hex':
+            record[name] = core.index_hex(table)
+    return record
+
+def process_chunk(formulas: List[str], forms: Tuple[str, ...], max_vars: int) -> List[Dict[str, object]]:
+    return [process_formula(formula, forms, max_vars) for formula in formulas]
+
+def iter_chunk_results(chunks: List[List[str]], forms: Tuple[str, ...], max_vars: int,
+                       workers: int) -> Iterator[List[Dict[str, object]]]:
+    """Результаты кусков по порядку; при workers > 1 — из пула процессов."""
+    if workers == 1 or len(chunks) < 2:
+        for chunk in chunks:
+            yield process_chunk(chunk, forms, max_vars)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(process_chunk, chunks, [forms] * len(chunks), [max_vars] * len(chunks))
+
+def run_batch(formulas: List[Tuple[int, str]], output: TextIO, forms: Iterable[str] = RECORD_FORMS,
+              workers: Optional[int] = None, chunk_size: int = 256, max_vars: int = 16,
+              progress: Optional[TextIO] = None) -> Dict[str, object]:
+    """Обрабатывает формулы и пишет JSONL в порядке ввода.
+
+    Одинаковые формулы считаются один раз. Уникальные формулы режутся на
+    куски по chunk_size и отдаются пулу процессов; записи для строк ввода
+    выводятся, как только готов кусок с их формулой. Возвращает сводку.
+    """
+    forms = tuple(forms)
+    unknown = set(forms) - set(RECORD_FORMS)
+    if unknown:
+        raise ValueError(f"Неизвестные формы: {', '.join(sorted(unknown))}")
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers и chunk_size должны быть не меньше 1")
+
+    unique = {}
+    for _, formula in formulas:
+        unique.setdefault(formula, len(unique))
+    unique_formulas = list(unique)
+    chunks = [unique_formulas[start:start + chunk_size] for start in range(0, len(unique_formulas), chunk_size)]
+
+    started = time.perf_counter()
+    results = []
+    next_line = 0
+    errors = 0
+    for chunk_results in iter_chunk_results(chunks, forms, max_vars, workers):
+        results.extend(chunk_results)
+        while next_line < len(formulas) and unique[formulas[next_line][1]] < len(results):
+            line_number, formula = formulas[next_line]
+            result = results[unique[formula]]
+            errors += 'error' in result
+            record = {'line': line_number, 'formula': formula}
+            record.update(result)
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            next_line += 1
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            rate = len(results) / elapsed if elapsed else 0.0
+            progress.write(f"\rОбработано {len(results)}/{len(unique_formulas)} уникальных формул, "
+                           f"{rate:.0f} формул/с")
+            progress.flush()
+
+    elapsed = time.perf_counter() - started
+    summary = {'formulas': len(formulas), 'unique': len(unique_formulas), 'errors': errors,
+               'seconds': round(elapsed, 3)}
+    if progress is not None:
+        progress.write(f"\nГотово: {len(formulas)} формул ({len(unique_formulas)} уникальных), "
+                       f"ошибок: {errors}, {elapsed:.2f} с\n")
+    return summary
+
+def parse_forms(text: str) -> Tuple[str, ...]:
+    forms = tuple(name.strip() for name in text.split(',') if name.strip())
+    unknown = [name for name in forms if name not in RECORD_FORMS]
+    if unknown or not forms:
+        raise argparse.ArgumentTypeError(
+            f"Неизвестные формы: {', '.join(unknown) or '(пусто)'}; доступны: {', '.join(RECORD_FORMS)}")
+    return forms
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пакетный перевод формул в КНФ/ДНФ и индексные формы (JSONL).")
+    parser.add_argument('input', nargs='?', default='-', help="файл с формулами, по одной в строке (- — stdin)")
+    parser.add_argument('-o', '--output', default='-', help="файл для JSONL (- — stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="число процессов (по умолчанию — число CPU)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="формул в одном задании для процесса")
+    parser.add_argument('--max-vars', type=int, default=16, help="предел числа переменных в формуле")
+    parser.add_argument('--forms', type=parse_forms, default=RECORD_FORMS,
+                        help=f"поля записи через запятую: {','.join(RECORD_FORMS)}")
+    parser.add_argument('-q', '--quiet', action='store_true', help="не выводить ход обработки в stderr")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.input == '-':
+        formulas = read_formulas(sys.stdin)
+    else:
+        with open(args.input, encoding='utf-8') as stream:
+            formulas = read_formulas(stream)
+    progress = None if args.quiet else sys.stderr
+    if args.output == '-':
+        run_batch(formulas, sys.stdout, args.forms, args.workers, args.chunk_size, args.max_vars, progress)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            run_batch(formulas, output, args.forms, args.workers, args.chunk_size, args.max_vars, progress)
+
+if __name__ == "__main__":
+    main()
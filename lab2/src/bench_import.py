@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Сценарии запуска: название и код, выполняемый в новом интерпретаторе
+SCENARIOS = (
+    ("Только проверка формулы", "import src.core as c; c.check_formula_validity('a & b')"),
+    ("Проверка и таблица", "import src.core as c; c.create_truth_table('a & b')"),
+    ("Старый импорт (logic_table *)", "from src.logic_table import *"),
+    ("main.present_results", "import src.main"),
+)
+
+def import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """Запускает код с python -X importtime и возвращает {модуль: (собственное, накопленное время, мкс)}."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=LAB_DIR,
+                               capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def startup_cost(code: str, repeat: int = 5) -> Tuple[int, int]:
+    """Лучшее за repeat запусков суммарное время импортов сверх пустого запуска и число лишних модулей."""
+    baseline = import_times('pass')
+    best = None
+    for _ in range(repeat):
+        times = import_times(code)
+        extra = {name: value for name, value in times.items() if name not in baseline}
+        total = sum(self_us for self_us, _ in extra.values())
+        if best is None or total < best[0]:
+            best = (total, len(extra))
+    return best
+
+def run_benchmark(repeat: int = 5) -> None:
+    print(f"{'Сценарий':<32} | {'Импорт, мс':>10} | {'Модулей':>7}")
+    for label, code in SCENARIOS:
+        total, modules = startup_cost(code, repeat)
+        print(f"{label:<32} | {total / 1000:>10.2f} | {modules:>7}")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
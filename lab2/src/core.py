@@ -0,0 +1,44 @@
+"""Ядро lab2: проверка формул, таблицы истинности и нормальные формы.
+
+check_formula_validity доступна сразу. Движок таблиц и построители форм
+живут в src._engine и загружаются при первом обращении к их именам, так
+что программа, которой нужна только проверка формулы, запускается быстро.
+"""
+__all__ = [
+    'VALID_CHARACTERS', 'check_formula_validity',
+    # Таблица истинности
+    'BINARY_OPERATORS', 'TruthTable', 'extract_variables', 'infix_to_postfix', 'apply_operators',
+    'compute_postfix', 'variable_column', 'display_header', 'create_truth_table',
+    # Нормальные формы
+    'FORM_NAMES', 'FLUSH_TERMS', 'table_results', 'clause_builder', 'emit_normal_forms', 'render_form',
+    'construct_cnf', 'construct_dnf', 'cnf_binary_form', 'cnf_decimal_form', 'dnf_binary_form',
+    'dnf_decimal_form',
+    # Индекс функции
+    'DECIMAL_CHUNK', 'get_binary_index', 'convert_to_decimal', 'function_index', 'table_from_index',
+    'index_bytes', 'index_hex', 'index_base64', 'iter_decimal', 'write_decimal', 'parse_index',
+    'default_variables', 'table_from_index_text',
+]
+
+_ENGINE_NAMES = frozenset(__all__) - {'VALID_CHARACTERS', 'check_formula_validity'}
+
+# Символы, допустимые в формуле (без re, чтобы не тянуть его при запуске)
+VALID_CHARACTERS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ|&!~>-() ')
+
+def check_formula_validity(formula: str) -> bool:
+    """Проверяет, содержит ли формула только допустимые символы."""
+    # Как и прежний шаблон r'^[...]+$', допускается один завершающий перевод строки
+    if formula.endswith('\n'):
+        formula = formula[:-1]
+    return bool(formula) and VALID_CHARACTERS.issuperset(formula)
+
+def __getattr__(name: str):
+    """Загружает движок при первом обращении к его имени (PEP 562)."""
+    if name not in _ENGINE_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from src import _engine
+    for engine_name in _ENGINE_NAMES:
+        globals()[engine_name] = getattr(_engine, engine_name)
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,26 +1,77 @@
-from src.formula_utils import *
-from src.logic_table import *
+import io
+import os
 
-def present_results(formula: str) -> None:
+from src import core
+
+# Заголовки разделов вывода и соответствующие формы emit_normal_forms
+SECTIONS = (
+    ("КНФ", 'cnf'),
+    ("ДНФ", 'dnf'),
+    ("КНФ (бинарная)", 'cnf_binary'),
+    ("КНФ (десятичная)", 'cnf_decimal'),
+    ("ДНФ (бинарная)", 'dnf_binary'),
+    ("ДНФ (десятичная)", 'dnf_decimal'),
+    ("Бинарный индекс", 'index'),
+)
+
+def present_results(formula: str, output_dir: str = None) -> None:
     """Выводит различные формы логической формулы."""
-    if not check_formula_validity(formula):
+    if not core.check_formula_validity(formula):
         raise ValueError("Формула содержит недопустимые символы!")
-    table, variables = create_truth_table(formula)
+    table, variables = core.create_truth_table(formula)
+    present_table(table, variables, output_dir)
+
+def present_index(index: str, output_dir: str = None) -> None:
+    """Выводит формы функции, заданной индексом (0x.., 0b.., b64:.. или десятичным)."""
+    table, variables = core.table_from_index_text(index)
+    print(f"Переменные: {', '.join(variables)}")
+    present_table(table, variables, output_dir)
+
+def present_table(table: 'core.TruthTable', variables: list, output_dir: str = None) -> None:
+    """Выводит формы функции по её таблице истинности.
+
+    Все формы строятся за один проход по таблице. Если задан output_dir,
+    каждая форма пишется в файл <output_dir>/<форма>.txt, а на экран
+    выводятся пути к файлам — так огромные формы не собираются в памяти.
+    """
     def show_section(label: str, content: str) -> None:
         print(f"{'-' * 40}\n{label}: {content}")
-    show_section("КНФ", construct_cnf(table, variables))
-    show_section("ДНФ", construct_dnf(table, variables))
-    show_section("КНФ (бинарная)", cnf_binary_form(table, variables))
-    show_section("КНФ (десятичная)", cnf_decimal_form(table, variables))
-    show_section("ДНФ (бинарная)", dnf_binary_form(table, variables))
-    show_section("ДНФ (десятичная)", dnf_decimal_form(table, variables))
-    show_section("Бинарный индекс", get_binary_index(table))
-    show_section("Десятичный индекс", convert_to_decimal(get_binary_index(table)))
+    if output_dir is None:
+        writers = {name: io.StringIO() for _, name in SECTIONS}
+        core.emit_normal_forms(table, variables, writers)
+        for label, name in SECTIONS:
+            show_section(label, writers[name].getvalue())
+        show_section("Десятичный индекс", ''.join(core.iter_decimal(core.function_index(table))))
+        show_section("Шестнадцатеричный индекс", "0x" + core.index_hex(table))
+        return
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, f"{name}.txt") for _, name in SECTIONS}
+    writers = {name: open(path, 'w', encoding='utf-8') for name, path in paths.items()}
+    try:
+        core.emit_normal_forms(table, variables, writers)
+    finally:
+        for stream in writers.values():
+            stream.close()
+    decimal_path = os.path.join(output_dir, "index_decimal.txt")
+    with open(decimal_path, 'w', encoding='utf-8') as stream:
+        core.write_decimal(core.function_index(table), stream)
+    for label, name in SECTIONS:
+        show_section(label, paths[name])
+    show_section("Десятичный индекс", decimal_path)
+    show_section("Шестнадцатеричный индекс", "0x" + core.index_hex(table))
+
+def is_index_text(text: str) -> bool:
+    """Похожа ли строка на запись индекса (0x.., 0b.., b64:.. или десятичную)."""
+    text = text.strip()
+    return text[:1].isdigit() or text[:4].lower() == 'b64:'
 
 def execute():
     """Основная функция для запуска программы."""
-    formula = input("Введите логическую формулу: ")
-    present_results(formula)
+    formula = input("Введите логическую формулу или индекс функции: ")
+    if is_index_text(formula):
+        present_index(formula)
+    else:
+        present_results(formula)
 
 if __name__ == "__main__":
     execute()
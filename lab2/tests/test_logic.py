@@ -1,7 +1,7 @@
 import pytest
 from src.formula_utils import *
 from src.logic_table import *
-from src.main import present_results
+from src.main import execute, present_index, present_results
 
 
 # Tests for formula_utils.py
@@ -89,6 +89,73 @@ def test_create_truth_table():
     assert table == [[0, 1], [1, 0]]
 
 
+def test_create_truth_table_operators():
+    table, vars = create_truth_table("a -> b", show=False)
+    assert [row[-1] for row in table] == [1, 1, 0, 1]
+    table, vars = create_truth_table("a ~ !b", show=False)
+    assert [row[-1] for row in table] == [0, 1, 1, 0]
+    table, vars = create_truth_table("!(a | b) & c", show=False)
+    assert table.bits == 0b10
+    with pytest.raises(ValueError):
+        create_truth_table("(a & b", show=False)
+
+
+def test_truth_table_view():
+    formula = " & ".join(f"({a} | !{b})" for a, b in zip("abcdefghijklmnopqrst", "bcdefghijklmnopqrsta"))
+    table, vars = create_truth_table(formula, show=False)
+    assert len(vars) == 20 and len(table) == 1 << 20
+    assert table[0] == [0] * 20 + [1]
+    assert table[-1] == [1] * 20 + [1]
+    assert table[1] == [0] * 19 + [1, 0]
+    assert table.bits == 1 | 1 << ((1 << 20) - 1)
+    small, _ = create_truth_table("a | b", show=False)
+    assert small[1:3] == [[0, 1, 1], [1, 0, 1]]
+    assert get_binary_index(small) == "0111"
+
+
+def test_emit_normal_forms():
+    import io
+    table, vars = create_truth_table("a | b & !c", show=False)
+    writers = {"cnf": io.StringIO(), "dnf_decimal": io.StringIO(), "index": io.StringIO()}
+    emit_normal_forms(table, vars, writers)
+    assert writers["cnf"].getvalue() == construct_cnf(list(table), vars) == "(a|b|c)&(a|b|!c)&(a|!b|!c)"
+    assert writers["dnf_decimal"].getvalue() == "|(2,4,5,6,7)"
+    assert writers["index"].getvalue() == "00101111"
+    with pytest.raises(ValueError):
+        emit_normal_forms(table, vars, {"sknf": io.StringIO()})
+
+
+def test_function_index_encodings():
+    table, vars = create_truth_table("a -> b", show=False)
+    assert function_index(table) == 13 == int(get_binary_index(table), 2)
+    assert index_hex(table) == "d"
+    table, vars = create_truth_table("a & b & c", show=False)
+    assert index_bytes(table) == b"\x01" and index_base64(table) == "AQ=="
+    for text in ("0x01", "b64:AQ==", "0b00000001"):
+        rebuilt, names = table_from_index_text(text)
+        assert rebuilt == table and names == ["a", "b", "c"]
+    assert parse_index("300") == (300, 4)
+    with pytest.raises(ValueError):
+        parse_index("0x123")
+    with pytest.raises(ValueError):
+        table_from_index(16, 2)
+
+
+def test_iter_decimal_huge():
+    import sys
+    number = 7 ** 20000
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        expected = str(number)
+    finally:
+        sys.set_int_max_str_digits(limit)
+    chunks = list(iter_decimal(number, chunk_digits=500))
+    assert "".join(chunks) == expected
+    assert all(len(chunk) == 500 for chunk in chunks[1:]) and 0 < len(chunks[0]) <= 500
+    assert convert_to_decimal(format(number, "b")) == expected
+
+
 def test_display_header(capsys):
     display_header(['a', 'b'])
     captured = capsys.readouterr()
@@ -109,3 +176,80 @@ def test_present_results(capsys):
     assert "ДНФ" in captured.out
     assert "КНФ (бинарная)" in captured.out  # Corrected expected label
     assert "ДНФ (десятичная)" in captured.out
+
+
+def test_present_results_to_directory(tmp_path, capsys):
+    present_results("a & !b", output_dir=str(tmp_path))
+    assert str(tmp_path / "dnf.txt") in capsys.readouterr().out
+    assert (tmp_path / "dnf.txt").read_text(encoding="utf-8") == "(a&!b)"
+    assert (tmp_path / "cnf_decimal.txt").read_text(encoding="utf-8") == "&(0,1,3)"
+
+
+def test_present_index(capsys):
+    present_index("0x8")
+    out = capsys.readouterr().out
+    assert "Переменные: a, b" in out and "ДНФ: (!a&!b)" in out and "Десятичный индекс: 8" in out
+
+
+def test_execute_reads_index(monkeypatch, capsys):
+    monkeypatch.setattr("builtins.input", lambda prompt: "b64:AQ==")
+    execute()
+    out = capsys.readouterr().out
+    assert "Переменные: a, b, c" in out and "ДНФ: (a&b&c)" in out
+    assert "Шестнадцатеричный индекс: 0x01" in out
+    assert table_from_index_text("0x01")[0] == create_truth_table("a & b & c", show=False)[0]
+
+
+# Tests for core.py
+def test_core_exports():
+    import src.core as core
+    import src.formula_utils as formula_utils
+    import src.logic_table as logic_table
+    for name in core.__all__:
+        assert getattr(formula_utils, name) is getattr(logic_table, name) is getattr(core, name)
+    with pytest.raises(AttributeError):
+        core.no_such_function
+
+
+def test_core_import_is_lazy():
+    from src.bench_import import import_times
+    baseline = set(import_times("pass"))
+    times = import_times("import src.core as c; assert c.check_formula_validity('a & b')")
+    assert "src.core" in times
+    assert not {"src._engine", "re", "decimal", "base64", "typing"} & (set(times) - baseline)
+    times = import_times("import src.core as c; c.create_truth_table('a & b')")
+    assert "src._engine" in times
+
+
+# Tests for batch.py
+def test_run_batch_order_and_errors():
+    import io
+    import json
+    from src.batch import read_formulas, run_batch
+    formulas = read_formulas(io.StringIO("a & b\n\na + b\n!a\na & b\na &\n!a\n"))
+    assert [line for line, _ in formulas] == [1, 3, 4, 5, 6, 7]
+    outputs = []
+    for workers in (1, 2):
+        output = io.StringIO()
+        summary = run_batch(formulas, output, ("dnf", "index_hex"), workers=workers, chunk_size=1)
+        outputs.append(output.getvalue())
+        assert summary["formulas"] == 6 and summary["unique"] == 4 and summary["errors"] == 2
+    assert outputs[0] == outputs[1]
+    records = [json.loads(line) for line in outputs[0].splitlines()]
+    assert [record["line"] for record in records] == [1, 3, 4, 5, 6, 7]
+    assert records[0] == {"line": 1, "formula": "a & b", "variables": ["a", "b"], "dnf": "(a&b)", "index_hex": "1"}
+    assert records[1]["error"] == "Формула содержит недопустимые символы!"
+    assert "error" in records[4] and records[5] == dict(records[2], line=7)
+
+
+def test_batch_cli(tmp_path, capsys):
+    import json
+    from src.batch import main as batch_main
+    source = tmp_path / "formulas.txt"
+    source.write_text("a | b\nabcdefghijklmnopq\n", encoding="utf-8")
+    target = tmp_path / "out.jsonl"
+    batch_main([str(source), "-o", str(target), "-w", "1", "--forms", "cnf_decimal"])
+    records = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["cnf_decimal"] == "&(0)"
+    assert records[1]["error"].startswith("Слишком много переменных")
+    assert "Готово: 2 формул" in capsys.readouterr().err
@@ -0,0 +1,155 @@
+# analysis.py
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from prettytable import PrettyTable
+
+from bdd import check_constant
+from expression_optimizer import optimized_truth_table
+from expression_parser import parse_postfix
+from logic_minimizer import (create_implicants, quine_mccluskey, select_prime_implicants, coverage_table,
+                             kmap_minimize, create_karnaugh_map, format_kmap_for_display,
+                             merge_terms, format_term_compact)
+from npn import NpnClassTable
+from result_cache import DEFAULT_CACHE, minimize_function
+
+
+def join_form(terms, is_minterm):
+    """SDNF or SKNF text of a term list, with the constant for an empty one"""
+    if not terms:
+        return "0" if is_minterm else "1"
+    return merge_terms([format_term_compact(term, is_minterm) for term in terms], " ∨ " if is_minterm else " ∧ ")
+
+
+@dataclass
+class ExpressionAnalysis:
+    """Everything run_program reports about an expression, computed on first access.
+
+    A caller that only reads sdnf_minimized pays for the truth table and one
+    Quine-McCluskey run; step strings, coverage tables, K-maps and
+    PrettyTables are built only when their fields are read. With a result
+    cache the minimized forms of a known function cost only a lookup, and
+    a miss minimizes both forms for the shared entry. An NPN class table,
+    if given, does that minimization once per class of functions that
+    differ only by renamed or negated variables and output.
+    """
+    expression: str
+    variables: list = field(default_factory=list)
+    postfix: list = field(default_factory=list)
+    cache: object = DEFAULT_CACHE
+    classes: NpnClassTable = None
+
+    @classmethod
+    def parse(cls, expression, cache=DEFAULT_CACHE, classes=None):
+        variables, postfix = parse_postfix(expression)
+        return cls(expression, variables, postfix, cache, classes)
+
+    @cached_property
+    def truth_table(self):
+        return optimized_truth_table(self.postfix, self.variables)
+
+    @cached_property
+    def truth_table_display(self):
+        pt = PrettyTable()
+        pt.field_names = list(self.variables) + [self.expression]
+        for combo, result in self.truth_table:
+            pt.add_row(combo + [result])
+        return pt
+
+    @cached_property
+    def constant(self):
+        """1 or 0 if the expression is constant, otherwise None"""
+        return check_constant(self.postfix, self.variables)
+
+    @cached_property
+    def minterms(self):
+        return create_implicants(self.truth_table, tuple(self.variables), 1)
+
+    @cached_property
+    def maxterms(self):
+        return create_implicants(self.truth_table, tuple(self.variables), 0)
+
+    @cached_property
+    def sdnf(self):
+        return join_form(self.minterms, True)
+
+    @cached_property
+    def sknf(self):
+        return join_form(self.maxterms, False)
+
+    @cached_property
+    def sdnf_primes(self):
+        """Prime implicants of the SDNF and the lazily formatted combination steps"""
+        return quine_mccluskey(self.minterms, True)
+
+    @cached_property
+    def sknf_primes(self):
+        return quine_mccluskey(self.maxterms, False)
+
+    @cached_property
+    def minimized_covers(self):
+        """SDNF and SKNF terms looked up in the result cache; one entry holds both forms"""
+        if self.classes is not None:
+            # Class covers may pick a different minimal cover, so they are cached apart from qm
+            return minimize_function(self.truth_table, self.variables, self.cache, 'npn',
+                                     lambda: self.classes.minimize(self.truth_table, self.variables))
+        return minimize_function(self.truth_table, self.variables, self.cache,
+                                 minimize=lambda: (self._select_terms(True), self._select_terms(False)))
+
+    def _select_terms(self, is_minterm):
+        if is_minterm:
+            return select_prime_implicants(self.minterms, self.sdnf_primes[0])
+        return select_prime_implicants(self.maxterms, self.sknf_primes[0])
+
+    @cached_property
+    def sdnf_terms(self):
+        if self.cache is None and self.classes is None:
+            return self._select_terms(True)
+        return self.minimized_covers[0]
+
+    @cached_property
+    def sknf_terms(self):
+        if self.cache is None and self.classes is None:
+            return self._select_terms(False)
+        return self.minimized_covers[1]
+
+    @cached_property
+    def sdnf_minimized(self):
+        return join_form(self.sdnf_terms, True)
+
+    @cached_property
+    def sknf_minimized(self):
+        return join_form(self.sknf_terms, False)
+
+    @cached_property
+    def sdnf_coverage(self):
+        return coverage_table(self.minterms, self.sdnf_primes[0], True)
+
+    @cached_property
+    def sknf_coverage(self):
+        return coverage_table(self.maxterms, self.sknf_primes[0], False)
+
+    @cached_property
+    def sdnf_kmap(self):
+        """Minimized SDNF terms and group steps from the Karnaugh map"""
+        return kmap_minimize(self.minterms, True, self.variables)
+
+    @cached_property
+    def sknf_kmap(self):
+        return kmap_minimize(self.maxterms, False, self.variables)
+
+    @cached_property
+    def sdnf_kmap_display(self):
+        return self._kmap_display(self.minterms, True)
+
+    @cached_property
+    def sknf_kmap_display(self):
+        return self._kmap_display(self.maxterms, False)
+
+    def _kmap_display(self, terms, is_minterm):
+        kmap, params = create_karnaugh_map(terms, self.variables, is_minterm)
+        return format_kmap_for_display(kmap, params) if kmap is not None else None
+
+
+def analyze(expression, cache=DEFAULT_CACHE, classes=None):
+    return ExpressionAnalysis.parse(expression, cache, classes)
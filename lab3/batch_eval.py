@@ -0,0 +1,76 @@
+# batch_eval.py
+from functools import lru_cache
+
+from expression_optimizer import optimize_expression
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; packed Python ints are used instead
+    np = None
+
+
+@lru_cache(maxsize=256)
+def _batch_program(expr_string, vars):
+    return optimize_expression(expr_string.split(), vars)
+
+
+def batch_program(expr, vars):
+    """Optimized straight-line program of a postfix expression, cached per expression"""
+    return _batch_program(' '.join(expr), tuple(vars))
+
+
+def pack_columns(samples, num_vars):
+    """Packed bit column per variable from rows of 0/1 values.
+
+    With numpy the columns are little-endian np.packbits byte arrays,
+    otherwise Python ints with bit i holding sample i.
+    """
+    if np is not None:
+        bits = np.asarray(samples, dtype=bool).reshape(-1, num_vars)
+        packed = np.packbits(bits, axis=0, bitorder='little')
+        return [np.ascontiguousarray(packed[:, k]) for k in range(num_vars)]
+
+    samples = list(samples)
+    buffers = [bytearray((len(samples) + 7) >> 3) for _ in range(num_vars)]
+    for index, row in enumerate(samples):
+        for k in range(num_vars):
+            if row[k]:
+                buffers[k][index >> 3] |= 1 << (index & 7)
+    return [int.from_bytes(buffer, 'little') for buffer in buffers]
+
+
+def evaluate_packed(expr, vars, columns, num_samples):
+    """Evaluate on packed columns given in vars order; returns a packed result column"""
+    program = batch_program(expr, vars)
+    if np is not None and columns and isinstance(columns[0], np.ndarray):
+        one = np.uint8(0xFF)
+        result = program.run(columns, one)
+        return np.broadcast_to(np.asarray(result, dtype=np.uint8), columns[0].shape)
+    one = (1 << num_samples) - 1
+    return program.run(columns, one) & one
+
+
+def evaluate_batch(expr, vars, samples):
+    """Results for a 2-D batch of samples (rows = samples, columns = variables in vars order).
+
+    Returns a uint8 numpy array when numpy is installed, otherwise a list of ints.
+    Each program instruction runs once per batch on packed bits.
+    """
+    num_vars = len(vars)
+    if np is not None:
+        samples = np.asarray(samples)
+        if samples.ndim != 2 or samples.shape[1] != num_vars:
+            raise ValueError(f"Expected a 2-D batch with {num_vars} columns, got shape {samples.shape}")
+        num_samples = samples.shape[0]
+        if num_vars == 0:
+            program = batch_program(expr, vars)
+            return np.full(num_samples, program.run([], 1), dtype=np.uint8)
+        packed = evaluate_packed(expr, vars, pack_columns(samples, num_vars), num_samples)
+        return np.unpackbits(packed, count=num_samples, bitorder='little')
+
+    samples = list(samples)
+    if any(len(row) != num_vars for row in samples):
+        raise ValueError(f"Every sample must have {num_vars} values")
+    packed = evaluate_packed(expr, vars, pack_columns(samples, num_vars), len(samples))
+    data = packed.to_bytes((len(samples) + 7) >> 3, 'little')
+    return [(data[index >> 3] >> (index & 7)) & 1 for index in range(len(samples))]
@@ -0,0 +1,303 @@
+# bdd.py
+from expression_parser import BINARY_OPERATORS, CONSTANTS
+
+FALSE = 0
+TRUE = 1
+
+
+class BDD:
+    """Manager for reduced ordered binary decision diagrams sharing one unique table.
+
+    Nodes are integers; 0 and 1 are the constant functions. Variable order is
+    the order of the variables list, the first variable being tested first.
+    """
+
+    def __init__(self, variables=()):
+        self.variables = []
+        self._levels = {}
+        # Per-node level, low child and high child; terminals sit below every variable
+        self._level = [None, None]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}
+        self._ite_cache = {}
+        for name in variables:
+            self.add_var(name)
+
+    def __len__(self):
+        return len(self._level)
+
+    def add_var(self, name):
+        """Append a variable at the bottom of the order"""
+        if name not in self._levels:
+            self._levels[name] = len(self.variables)
+            self.variables.append(name)
+        return self.var(name)
+
+    def level(self, node):
+        return len(self.variables) if node <= TRUE else self._level[node]
+
+    def low(self, node):
+        return self._low[node]
+
+    def high(self, node):
+        return self._high[node]
+
+    def node(self, level, low, high):
+        """Unique node testing the variable at level"""
+        if low == high:
+            return low
+        key = (level, low, high)
+        found = self._unique.get(key)
+        if found is None:
+            found = len(self._level)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = found
+        return found
+
+    def var(self, name):
+        if name not in self._levels:
+            raise KeyError(f"Unknown variable: {name}")
+        return self.node(self._levels[name], FALSE, TRUE)
+
+    def cofactors(self, node, level):
+        if self.level(node) != level:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def ite(self, f, g, h):
+        """If-then-else: the function f & g | !f & h.
+
+        The Shannon expansion runs on an explicit stack of pending calls and
+        node builds, so deep diagrams do not hit the recursion limit.
+        """
+        results = []
+        pending = [(f, g, h)]
+        while pending:
+            task = pending.pop()
+            if len(task) == 2:
+                # Both cofactor results are ready: build the node for (f, g, h) at level top
+                key, top = task
+                high = results.pop()
+                low = results.pop()
+                result = self.node(top, low, high)
+                self._ite_cache[key] = result
+                results.append(result)
+                continue
+            f, g, h = task
+            result = self._ite_terminal(f, g, h)
+            if result is not None:
+                results.append(result)
+                continue
+            top = min(self.level(f), self.level(g), self.level(h))
+            f0, f1 = self.cofactors(f, top)
+            g0, g1 = self.cofactors(g, top)
+            h0, h1 = self.cofactors(h, top)
+            pending.append((task, top))
+            pending.append((f1, g1, h1))
+            pending.append((f0, g0, h0))
+        return results[0]
+
+    def _ite_terminal(self, f, g, h):
+        """Result of ite(f, g, h) without expansion, or None if it has to be expanded"""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        return self._ite_cache.get((f, g, h))
+
+    def apply_not(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def apply(self, op, f, g):
+        """Combine two functions with one of the lab3 binary operators"""
+        if op == '&':
+            return self.ite(f, g, FALSE)
+        if op == '|':
+            return self.ite(f, TRUE, g)
+        if op == '->':
+            return self.ite(f, g, TRUE)
+        if op == '~':
+            return self.ite(f, g, self.apply_not(g))
+        if op == '^':
+            return self.ite(f, self.apply_not(g), g)
+        if op == 'nand':
+            return self.ite(f, self.apply_not(g), TRUE)
+        if op == 'nor':
+            return self.ite(f, FALSE, self.apply_not(g))
+        raise ValueError(f"Unknown operator: {op}")
+
+    def from_postfix(self, expr):
+        """Build the diagram of an infix_to_postfix token list, adding unseen variables"""
+        stack = []
+        for token in expr:
+            if token == '!':
+                stack.append(self.apply_not(stack.pop()))
+            elif token in BINARY_OPERATORS:
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(self.apply(token, left, right))
+            elif token in CONSTANTS:
+                stack.append(TRUE if token == '1' else FALSE)
+            else:
+                stack.append(self.add_var(token))
+        if len(stack) != 1:
+            raise ValueError("Malformed postfix expression")
+        return stack[0]
+
+    def size(self, f):
+        """Number of nodes reachable from f, terminals included"""
+        seen = set()
+        pending = [f]
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node > TRUE:
+                pending.append(self._low[node])
+                pending.append(self._high[node])
+        return len(seen)
+
+    def satcount(self, f):
+        """Number of assignments to all manager variables that satisfy f"""
+        counts = {FALSE: 0, TRUE: 1}
+        # Children sit on deeper levels, so counting deepest nodes first needs no recursion
+        for node in sorted(self._reachable(f), key=self._level.__getitem__, reverse=True):
+            level = self._level[node]
+            low, high = self._low[node], self._high[node]
+            counts[node] = (counts[low] << (self.level(low) - level - 1)) + \
+                           (counts[high] << (self.level(high) - level - 1))
+        return counts[f] << self.level(f)
+
+    def _reachable(self, f):
+        """Non-terminal nodes reachable from f"""
+        seen = set()
+        pending = [f]
+        while pending:
+            node = pending.pop()
+            if node <= TRUE or node in seen:
+                continue
+            seen.add(node)
+            pending.append(self._low[node])
+            pending.append(self._high[node])
+        return seen
+
+    def is_tautology(self, f):
+        return f == TRUE
+
+    def is_satisfiable(self, f):
+        return f != FALSE
+
+    def equivalent(self, f, g):
+        return f == g
+
+    def restrict(self, f, name, value):
+        """Cofactor of f with variable name fixed to value"""
+        target = self._levels[name]
+        memo = {}
+
+        def walk(node):
+            if node <= TRUE or self._level[node] > target:
+                return node
+            if node in memo:
+                return memo[node]
+            level = self._level[node]
+            if level == target:
+                result = self._high[node] if value else self._low[node]
+            else:
+                result = self.node(level, walk(self._low[node]), walk(self._high[node]))
+            memo[node] = result
+            return result
+
+        return walk(f)
+
+    def exists(self, f, names):
+        """Existential quantification of f over the given variables"""
+        return self._quantify(f, names, lambda low, high: self.ite(low, TRUE, high))
+
+    def forall(self, f, names):
+        """Universal quantification of f over the given variables"""
+        return self._quantify(f, names, lambda low, high: self.ite(low, high, FALSE))
+
+    def _quantify(self, f, names, combine):
+        levels = {self._levels[name] for name in names}
+        deepest = max(levels, default=-1)
+        memo = {}
+
+        def walk(node):
+            if node <= TRUE or self._level[node] > deepest:
+                return node
+            if node in memo:
+                return memo[node]
+            level = self._level[node]
+            low, high = walk(self._low[node]), walk(self._high[node])
+            result = combine(low, high) if level in levels else self.node(level, low, high)
+            memo[node] = result
+            return result
+
+        return walk(f)
+
+    def iter_paths(self, f):
+        """Yield satisfying cubes as {variable: value} dicts, one per path to TRUE"""
+        path = {}
+
+        def walk(node):
+            if node == TRUE:
+                yield dict(path)
+                return
+            if node == FALSE:
+                return
+            name = self.variables[self._level[node]]
+            for value, child in ((0, self._low[node]), (1, self._high[node])):
+                path[name] = value
+                yield from walk(child)
+            del path[name]
+
+        yield from walk(f)
+
+    def iter_minterms(self, f):
+        """Yield satisfying assignments as truth table row indices, in increasing order"""
+        num_vars = len(self.variables)
+
+        def walk(node, level, prefix):
+            if node == FALSE:
+                return
+            if level == num_vars:
+                yield prefix
+                return
+            if self.level(node) == level:
+                yield from walk(self._low[node], level + 1, prefix << 1)
+                yield from walk(self._high[node], level + 1, (prefix << 1) | 1)
+            else:
+                yield from walk(node, level + 1, prefix << 1)
+                yield from walk(node, level + 1, (prefix << 1) | 1)
+
+        yield from walk(f, 0, 0)
+
+
+def expression_bdd(expr, variables):
+    """Manager over variables and the diagram of a postfix expression"""
+    manager = BDD(variables)
+    return manager, manager.from_postfix(expr)
+
+
+def check_constant(expr, variables):
+    """1 or 0 if the postfix expression is constant, otherwise None"""
+    _, root = expression_bdd(expr, variables)
+    if root == TRUE:
+        return 1
+    if root == FALSE:
+        return 0
+    return None
+
+
+def expressions_equivalent(expr1, expr2, variables=()):
+    manager = BDD(variables)
+    return manager.from_postfix(expr1) == manager.from_postfix(expr2)
@@ -0,0 +1,46 @@
+# bench_batch.py
+import random
+import sys
+import timeit
+
+from prettytable import PrettyTable
+
+from batch_eval import evaluate_batch, np
+from expression_parser import parse_postfix
+from expression_processor import compute_expression, evaluate_many
+
+EXPRESSION = "(req_a & !ack | grant_b ^ hold) -> (mode nor stall) ~ (req_a nand grant_b) | valid & !hold"
+
+
+def measure(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run_benchmark(sizes, expression=EXPRESSION, seed=0):
+    """Throughput of per-row and batch evaluation, in samples per second"""
+    variables, postfix = parse_postfix(expression)
+    rng = random.Random(seed)
+    pt = PrettyTable()
+    pt.field_names = ["Samples", "compute_expression, rows/s", "compiled, rows/s",
+                      "batch, rows/s", "speedup"]
+    for size in sizes:
+        rows = [[rng.getrandbits(1) for _ in variables] for _ in range(size)]
+        dicts = [dict(zip(variables, row)) for row in rows]
+        samples = np.array(rows, dtype=np.uint8) if np is not None else rows
+
+        per_row = measure(lambda: [compute_expression(postfix, values) for values in dicts])
+        compiled = measure(lambda: evaluate_many(postfix, variables, rows))
+        batch = measure(lambda: evaluate_batch(postfix, variables, samples))
+        pt.add_row([
+            size,
+            f"{size / per_row:,.0f}",
+            f"{size / compiled:,.0f}",
+            f"{size / batch:,.0f}",
+            f"{per_row / batch:.0f}x",
+        ])
+    return pt
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(run_benchmark(sizes))
@@ -0,0 +1,63 @@
+# bench_parsing.py
+import random
+import sys
+import timeit
+
+from prettytable import PrettyTable
+
+from expression_parser import tokenize_input, extract_vars, infix_to_postfix, parse_expression
+from expression_processor import compute_expression, compile_expression
+from expression_optimizer import optimize_expression
+
+OPERATORS = ['&', '|', '->', '~']
+VARIABLES = 'abcde'
+
+
+def build_expression(num_operands, seed=0):
+    """Random expression with the given number of operands over five variables"""
+    rng = random.Random(seed)
+    parts = [rng.choice(VARIABLES)]
+    for _ in range(num_operands - 1):
+        operand = rng.choice(VARIABLES)
+        if rng.random() < 0.3:
+            operand = f"!{operand}"
+        if rng.random() < 0.2:
+            operand = f"({operand} | {rng.choice(VARIABLES)})"
+        parts.append(f" {rng.choice(OPERATORS)} {operand}")
+    return "".join(parts)
+
+
+def measure(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def run_benchmark(sizes):
+    pt = PrettyTable()
+    pt.field_names = ["Tokens", "tokenize, ms", "extract_vars, ms", "to postfix, ms",
+                      "parse AST, ms", "evaluate, ms", "compiled eval, ms",
+                      "optimize, ms", "program size"]
+    for size in sizes:
+        expression = build_expression(size)
+        tokens = tokenize_input(expression)
+        variables = extract_vars(tokens)
+        postfix = infix_to_postfix(tokens)
+        values = dict.fromkeys(variables, 1)
+        compiled = compile_expression(postfix, variables)
+        args = [values[var] for var in variables]
+        pt.add_row([
+            len(tokens),
+            f"{measure(lambda: tokenize_input(expression)):.2f}",
+            f"{measure(lambda: extract_vars(tokens)):.2f}",
+            f"{measure(lambda: infix_to_postfix(tokens)):.2f}",
+            f"{measure(lambda: parse_expression(expression)):.2f}",
+            f"{measure(lambda: compute_expression(postfix, values)):.2f}",
+            f"{measure(lambda: compiled(*args)):.3f}",
+            f"{measure(lambda: optimize_expression(postfix, variables)):.2f}",
+            len(optimize_expression(postfix, variables)),
+        ])
+    return pt
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [500, 1000, 2000, 4000, 8000]
+    print(run_benchmark(sizes))
@@ -0,0 +1,171 @@
+# cover_solver.py
+import time
+from dataclasses import dataclass, field
+
+DEFAULT_TIME_BUDGET = 2.0
+
+
+@dataclass
+class CoverSolution:
+    """Chosen columns of a set-cover problem, their cost and whether it is proven minimal"""
+    selected: list = field(default_factory=list)
+    cost: int = 0
+    optimal: bool = True
+    literals: int = 0
+
+
+class _Timeout(Exception):
+    pass
+
+
+def bits(mask):
+    """Indices of set bits in increasing order"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def greedy_cover(columns, universe, weights, chosen=()):
+    """Pick the cheapest column per newly covered row until the universe is covered"""
+    selected = list(chosen)
+    for j in chosen:
+        universe &= ~columns[j]
+    while universe:
+        best = None
+        best_ratio = None
+        for j, column in enumerate(columns):
+            gain = (column & universe).bit_count()
+            if gain and (best is None or weights[j] * best_gain < best_ratio * gain):
+                best, best_ratio, best_gain = j, weights[j], gain
+        if best is None:
+            break
+        selected.append(best)
+        universe &= ~columns[best]
+    return selected
+
+
+def reduce_matrix(columns, universe, weights, active):
+    """Apply essential-column, row-dominance and column-dominance reductions.
+
+    Returns the essential columns, the remaining universe, the active columns and
+    whether every remaining row can still be covered.
+    """
+    essential = []
+    while True:
+        active = [j for j in active if columns[j] & universe]
+        rows = {}
+        for j in active:
+            for row in bits(columns[j] & universe):
+                rows[row] = rows.get(row, 0) | (1 << j)
+        if len(rows) != universe.bit_count():
+            return essential, universe, active, False
+
+        changed = False
+        for row, row_columns in rows.items():
+            if row_columns & (row_columns - 1) == 0:
+                j = row_columns.bit_length() - 1
+                essential.append(j)
+                universe &= ~columns[j]
+                changed = True
+                break
+        if changed:
+            continue
+
+        # A row whose columns are a superset of another row's columns is always covered
+        row_items = sorted(rows.items(), key=lambda item: item[1].bit_count())
+        for i, (row, row_columns) in enumerate(row_items):
+            for other, other_columns in row_items[:i]:
+                if (universe >> other) & 1 and other_columns & row_columns == other_columns:
+                    universe &= ~(1 << row)
+                    changed = True
+                    break
+
+        # A column covering a subset of a cheaper or equal column's rows is never needed
+        kept = []
+        for j in active:
+            rows_j = columns[j] & universe
+            dominated = any(
+                k != j and weights[k] <= weights[j] and columns[k] & rows_j == rows_j
+                and (weights[k] < weights[j] or (columns[k] & universe) != rows_j or k < j)
+                for k in active
+            )
+            if dominated:
+                changed = True
+            else:
+                kept.append(j)
+        active = kept
+        if not changed:
+            return essential, universe, active, True
+
+
+def lower_bound(columns, universe, weights, active):
+    """Sum of cheapest covers over a set of rows no single column covers twice"""
+    row_columns = {}
+    for j in active:
+        for row in bits(columns[j] & universe):
+            row_columns.setdefault(row, []).append(j)
+    bound = 0
+    used = 0
+    for row, candidates in sorted(row_columns.items(), key=lambda item: len(item[1])):
+        if any(columns[j] & used for j in candidates):
+            continue
+        used |= 1 << row
+        bound += min(weights[j] for j in candidates)
+    return bound
+
+
+def solve_cover(columns, universe, weights=None, time_budget=DEFAULT_TIME_BUDGET):
+    """Find a minimum-weight set of columns covering every row bit of universe.
+
+    Columns are bitsets over rows. The search is branch-and-bound; if the time
+    budget runs out, the best cover found so far (at worst the greedy one) is
+    returned with optimal=False.
+    """
+    if weights is None:
+        weights = [1] * len(columns)
+    total = 0
+    for column in columns:
+        total |= column
+    if universe & ~total:
+        raise ValueError("Some rows cannot be covered by any column")
+
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    best = greedy_cover(columns, universe, weights)
+    state = {'best': best, 'cost': sum(weights[j] for j in best)}
+
+    def search(universe, active, chosen, cost):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise _Timeout
+        essential, universe, active, feasible = reduce_matrix(columns, universe, weights, active)
+        if not feasible:
+            return
+        chosen = chosen + essential
+        cost += sum(weights[j] for j in essential)
+        if not universe:
+            if cost < state['cost']:
+                state['best'], state['cost'] = chosen, cost
+            return
+        if cost + lower_bound(columns, universe, weights, active) >= state['cost']:
+            return
+
+        # Branch on the row with the fewest candidate columns
+        branch_row = None
+        candidates = None
+        for row in bits(universe):
+            row_candidates = [j for j in active if (columns[j] >> row) & 1]
+            if candidates is None or len(row_candidates) < len(candidates):
+                branch_row, candidates = row, row_candidates
+        candidates.sort(key=lambda j: (weights[j], -(columns[j] & universe).bit_count(), j))
+        for i, j in enumerate(candidates):
+            # Columns tried in earlier branches are excluded to avoid revisiting covers
+            excluded = set(candidates[:i])
+            search(universe & ~columns[j], [k for k in active if k not in excluded and k != j],
+                   chosen + [j], cost + weights[j])
+
+    optimal = True
+    try:
+        search(universe, list(range(len(columns))), [], 0)
+    except _Timeout:
+        optimal = False
+    return CoverSolution(sorted(set(state['best'])), state['cost'], optimal)
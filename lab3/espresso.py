@@ -0,0 +1,200 @@
+# espresso.py
+from functools import lru_cache
+
+from expression_processor import full_mask, variable_column
+from implicant import Implicant, implicants_from_terms
+
+MAX_ITERATIONS = 20
+
+
+@lru_cache(maxsize=8)
+def variable_columns(num_vars):
+    """Packed columns of every variable, cached per variable count"""
+    return tuple(variable_column(position, num_vars) for position in range(num_vars))
+
+
+def cube_mask(value, care, num_vars):
+    """Packed set of truth table rows covered by a cube"""
+    mask = 1 << value
+    free = ((1 << num_vars) - 1) & ~care
+    for shift in range(num_vars):
+        if (free >> shift) & 1:
+            mask |= mask << (1 << shift)
+    return mask
+
+
+def cover_mask(cubes, num_vars):
+    """Packed set of truth table rows covered by any cube of a cover"""
+    mask = 0
+    for cube in cubes:
+        mask |= cube_mask(cube.value, cube.care, num_vars)
+    return mask
+
+
+def raise_literal(mask, shift, is_one):
+    """Grow a cube's row set across the variable at the given bit"""
+    distance = 1 << shift
+    return mask | (mask >> distance if is_one else mask << distance)
+
+
+def expand_cube(value, care, off_set, gain, num_vars):
+    """Raise literals while the cube stays clear of the off-set.
+
+    Literals whose removal covers most rows in gain are raised first.
+    """
+    mask = cube_mask(value, care, num_vars)
+    candidates = []
+    for shift in range(num_vars):
+        bit = 1 << shift
+        if care & bit:
+            raised = raise_literal(mask, shift, value & bit)
+            if not raised & off_set:
+                candidates.append(((raised & gain).bit_count(), shift))
+    candidates.sort(reverse=True)
+
+    for _, shift in candidates:
+        bit = 1 << shift
+        raised = raise_literal(mask, shift, value & bit)
+        if not raised & off_set:
+            mask = raised
+            care &= ~bit
+            value &= ~bit
+    return value, care, mask
+
+
+def initial_cover(on_set, off_set, num_vars):
+    """Cover the on-set greedily, expanding the lowest uncovered row into a prime each time"""
+    cubes = []
+    uncovered = on_set
+    care_all = (1 << num_vars) - 1
+    while uncovered:
+        index = (uncovered & -uncovered).bit_length() - 1
+        value, care, mask = expand_cube(index, care_all, off_set, uncovered, num_vars)
+        cubes.append([value, care, mask])
+        uncovered &= ~mask
+    return cubes
+
+
+def expand(cubes, off_set, on_set, num_vars):
+    """Expand every cube to a prime and drop cubes contained in an expanded one"""
+    result = []
+    covered = 0
+    for value, care, mask in sorted(cubes, key=lambda cube: cube[1].bit_count()):
+        if not mask & on_set & ~covered:
+            continue
+        value, care, mask = expand_cube(value, care, off_set, on_set & ~covered, num_vars)
+        result = [cube for cube in result if cube[2] & ~mask]
+        result.append([value, care, mask])
+        covered |= mask
+    return result
+
+
+def irredundant(cubes, on_set):
+    """Remove cubes whose on-set rows are covered by the rest of the cover"""
+    once = twice = 0
+    for _, _, mask in cubes:
+        twice |= once & mask
+        once |= mask
+    only = once & ~twice & on_set
+
+    essential = [cube for cube in cubes if cube[2] & only]
+    optional = [cube for cube in cubes if not cube[2] & only]
+    optional.sort(key=lambda cube: cube[1].bit_count(), reverse=True)
+
+    kept = list(optional)
+    for cube in optional:
+        rest = 0
+        for other in essential:
+            rest |= other[2]
+        for other in kept:
+            if other is not cube:
+                rest |= other[2]
+        if not cube[2] & on_set & ~rest:
+            kept.remove(cube)
+    return essential + kept
+
+
+def reduce(cubes, on_set, num_vars):
+    """Shrink each cube to the smallest cube containing the rows only it covers"""
+    columns = variable_columns(num_vars)
+    everything = full_mask(num_vars)
+    cubes = sorted(cubes, key=lambda cube: cube[1].bit_count())
+    result = []
+    for i, cube in enumerate(cubes):
+        rest = 0
+        for other in result:
+            rest |= other[2]
+        for other in cubes[i + 1:]:
+            rest |= other[2]
+        unique = cube[2] & on_set & ~rest
+        if not unique:
+            continue
+
+        value, care = cube[0], cube[1]
+        for position, column in enumerate(columns):
+            bit = 1 << (num_vars - position - 1)
+            if care & bit:
+                continue
+            if not unique & column:
+                care |= bit
+            elif not unique & (everything ^ column):
+                care |= bit
+                value |= bit
+        result.append([value, care, cube_mask(value, care, num_vars)])
+    return result
+
+
+def cover_cost(cubes):
+    return len(cubes), sum(cube[1].bit_count() for cube in cubes)
+
+
+def espresso(on_set, variables, dc_set=0, cover=None):
+    """Heuristic two-level minimization of a function given as packed truth table columns.
+
+    Runs the expand / irredundant / reduce loop until the cover stops shrinking.
+    Returns implicants over variables and a list of step descriptions.
+    """
+    variables = tuple(variables)
+    num_vars = len(variables)
+    on_set &= ~dc_set
+    if not on_set:
+        return [], []
+    off_set = full_mask(num_vars) & ~(on_set | dc_set)
+
+    if cover is None:
+        cubes = initial_cover(on_set, off_set, num_vars)
+    else:
+        cubes = [[cube.value, cube.care, cube_mask(cube.value, cube.care, num_vars)]
+                 for cube in cover]
+    cubes = irredundant(expand(cubes, off_set, on_set, num_vars), on_set)
+    cost = cover_cost(cubes)
+    steps = [f"Initial cover: {cost[0]} cubes, {cost[1]} literals"]
+
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        candidate = reduce(cubes, on_set, num_vars)
+        candidate = irredundant(expand(candidate, off_set, on_set, num_vars), on_set)
+        candidate_cost = cover_cost(candidate)
+        if candidate_cost >= cost:
+            break
+        cubes, cost = candidate, candidate_cost
+        steps.append(f"Iteration {iteration}: {cost[0]} cubes, {cost[1]} literals")
+
+    implicants = [Implicant(value, care, variables) for value, care, _ in cubes]
+    implicants.sort(key=Implicant.pattern)
+    return implicants, steps
+
+
+def espresso_cover(cover, variables=None, dc_cover=()):
+    """Minimize a function given as a cube cover of its on-set (and optional don't-care cubes)"""
+    if variables is None and cover and isinstance(cover[0], Implicant):
+        variables = cover[0].variables
+    cover = implicants_from_terms(cover, variables)
+    if not cover:
+        return [], []
+    variables = cover[0].variables
+    dc_cover = implicants_from_terms(dc_cover, variables)
+    num_vars = len(variables)
+    on_set = cover_mask(cover, num_vars)
+    dc_set = cover_mask(dc_cover, num_vars)
+    seed = cover if len(cover) <= 1 << (num_vars // 2) else None
+    return espresso(on_set, variables, dc_set, seed)
@@ -0,0 +1,215 @@
+# expression_optimizer.py
+from dataclasses import dataclass, field
+
+from expression_parser import AstBuilder, BINARY_OPERATORS, CONSTANTS, iter_nodes, node_variables
+from expression_processor import COMPILED_OPERATORS, TruthTableView, full_mask, variable_column
+
+
+class SimplifyingBuilder(AstBuilder):
+    """AstBuilder that folds constants and rewrites while hash-consing.
+
+    Every operator is reduced to NOT, AND, OR and XOR with operands in uid
+    order, so a & b, b & a and !(!a | !b) style variants share a node where
+    the rewrites below reach them.
+    """
+
+    def negate(self, child):
+        if child.op == 'const':
+            return self.const(child.name == '0')
+        if child.op == '!':
+            return child.children[0]
+        return super().negate(child)
+
+    def binary(self, op, left, right):
+        if op == '->':
+            return self.disjunction(self.negate(left), right)
+        if op == 'nand':
+            return self.negate(self.conjunction(left, right))
+        if op == 'nor':
+            return self.negate(self.disjunction(left, right))
+        if op == '~':
+            return self.negate(self.exclusive(left, right))
+        if op == '&':
+            return self.conjunction(left, right)
+        if op == '|':
+            return self.disjunction(left, right)
+        if op == '^':
+            return self.exclusive(left, right)
+        raise ValueError(f"Unknown operator: {op}")
+
+    def conjunction(self, left, right):
+        return self._lattice('&', '|', '0', left, right)
+
+    def disjunction(self, left, right):
+        return self._lattice('|', '&', '1', left, right)
+
+    def _lattice(self, op, dual, dominant, left, right):
+        for first, second in ((left, right), (right, left)):
+            if first.op == 'const':
+                # x & 0 = 0, x & 1 = x and the duals for |
+                return first if first.name == dominant else second
+            if first.op == '!' and first.children[0] is second:
+                return self.const(dominant)
+            if first.op == dual and second in first.children:
+                # Absorption: x & (x | y) = x
+                return second
+            if first.op == op and second in first.children:
+                # x & (x & y) = x & y
+                return first
+        if left is right:
+            return left
+        if left.uid > right.uid:
+            left, right = right, left
+        return self._intern(op, (left, right))
+
+    def exclusive(self, left, right):
+        for first, second in ((left, right), (right, left)):
+            if first.op == 'const':
+                return second if first.name == '0' else self.negate(second)
+        if left is right:
+            return self.const(0)
+        negated = False
+        if left.op == '!':
+            left, negated = left.children[0], not negated
+        if right.op == '!':
+            right, negated = right.children[0], not negated
+        if left is right:
+            return self.const(negated)
+        if left.uid > right.uid:
+            left, right = right, left
+        node = self._intern('^', (left, right))
+        return self.negate(node) if negated else node
+
+
+def build_dag(expr, builder=None):
+    """Hash-consed, simplified DAG of a postfix expression"""
+    builder = builder if builder is not None else SimplifyingBuilder()
+    stack = []
+    for token in expr:
+        if token == '!':
+            stack.append(builder.negate(stack.pop()))
+        elif token in BINARY_OPERATORS:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(builder.binary(token, left, right))
+        elif token in CONSTANTS:
+            stack.append(builder.const(token == '1'))
+        else:
+            stack.append(builder.var(token))
+    if len(stack) != 1:
+        raise ValueError("Malformed postfix expression")
+    return stack[0]
+
+
+@dataclass
+class Program:
+    """Straight-line program over numbered slots.
+
+    Slots 0..n-1 hold the variables; instruction k writes slot n + k and is an
+    (op, operands) pair with op one of 'const', '!', '&', '|', '^'.
+    """
+    variables: list
+    instructions: list = field(default_factory=list)
+    result: int = 0
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def slot_name(self, slot):
+        num_vars = len(self.variables)
+        return self.variables[slot] if slot < num_vars else f"t{slot - num_vars}"
+
+    def format(self):
+        lines = []
+        for k, (op, operands) in enumerate(self.instructions):
+            if op == 'const':
+                code = str(operands[0])
+            elif op == '!':
+                code = f"!{self.slot_name(operands[0])}"
+            else:
+                code = f" {op} ".join(self.slot_name(slot) for slot in operands)
+            lines.append(f"t{k} = {code}")
+        lines.append(f"return {self.slot_name(self.result)}")
+        return "\n".join(lines)
+
+    def run(self, values, one):
+        """Evaluate with slot values given for the variables; one is the all-true value"""
+        slots = list(values)
+        for op, operands in self.instructions:
+            if op == 'const':
+                slots.append(one if operands[0] else 0)
+            elif op == '!':
+                slots.append(one ^ slots[operands[0]])
+            elif op == '&':
+                slots.append(slots[operands[0]] & slots[operands[1]])
+            elif op == '|':
+                slots.append(slots[operands[0]] | slots[operands[1]])
+            else:
+                slots.append(slots[operands[0]] ^ slots[operands[1]])
+        return slots[self.result]
+
+    def evaluate(self, val_dict):
+        return self.run([val_dict[var] for var in self.variables], 1)
+
+    def evaluate_columns(self, columns, mask):
+        """Evaluate on packed columns: every instruction runs once for all rows"""
+        return self.run([columns[var] for var in self.variables], mask)
+
+    def compile(self):
+        """Python function taking variable values positionally"""
+        args = ['v' + str(i) for i in range(len(self.variables))]
+        num_vars = len(args)
+
+        def name(slot):
+            return args[slot] if slot < num_vars else f"t{slot - num_vars}"
+
+        lines = []
+        for k, (op, operands) in enumerate(self.instructions):
+            if op == 'const':
+                code = str(operands[0])
+            elif op == '!':
+                code = '1 ^ ' + name(operands[0])
+            else:
+                code = COMPILED_OPERATORS[op].format(*map(name, operands))
+            lines.append(f"    t{k} = {code}\n")
+        source = f"def compiled({', '.join(args)}):\n{''.join(lines)}    return {name(self.result)}\n"
+        namespace = {}
+        exec(compile(source, '<program>', 'exec'), namespace)
+        return namespace['compiled']
+
+
+def emit_program(root, variables=None):
+    """Straight-line program with one numbered temporary per unique DAG node"""
+    variables = list(variables) if variables is not None else node_variables(root)
+    program = Program(variables)
+    slots = {}
+    for position, var in enumerate(variables):
+        slots[var] = position
+    node_slots = {}
+    for node in iter_nodes(root):
+        if node.op == 'var':
+            if node.name not in slots:
+                raise ValueError(f"Variable missing from the variable list: {node.name}")
+            node_slots[node.uid] = slots[node.name]
+            continue
+        if node.op == 'const':
+            program.instructions.append(('const', (int(node.name),)))
+        else:
+            operands = tuple(node_slots[child.uid] for child in node.children)
+            program.instructions.append((node.op, operands))
+        node_slots[node.uid] = len(variables) + len(program.instructions) - 1
+    program.result = node_slots[root.uid]
+    return program
+
+
+def optimize_expression(expr, variables=None):
+    """Straight-line program of a postfix expression after CSE and simplification"""
+    return emit_program(build_dag(expr), variables)
+
+
+def optimized_truth_table(expr, vars):
+    """generate_truth_table through the optimized program"""
+    num_vars = len(vars)
+    program = optimize_expression(expr, vars)
+    columns = {var: variable_column(position, num_vars) for position, var in enumerate(vars)}
+    return TruthTableView(program.evaluate_columns(columns, full_mask(num_vars)), num_vars)
@@ -1,40 +1,75 @@
 # expression_parser.py
 import helpers as hlp
 
+IDENT_START = 'abcdefghijklmnopqrstuvwxyz_'
+IDENT_CHARS = IDENT_START + '0123456789'
+CONSTANTS = ('0', '1')
+BINARY_OPERATORS = ('&', '|', '->', '~', '^', 'nand', 'nor')
+KEYWORD_OPERATORS = {'xor': '^', 'nand': 'nand', 'nor': 'nor'}
+SYMBOL_OPERATORS = {'↑': 'nand', '↓': 'nor', '⊕': '^'}
 
-def valid_var(char):
-    return char in 'abcdefghijklmnopqrstuvwxyz'
 
+class ParseError(ValueError):
+    """Syntax error with the character position it was found at"""
 
-def tokenize_input(expression):
+    def __init__(self, message, position):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+def valid_var(token):
+    if not token or token[0] not in IDENT_START or token in KEYWORD_OPERATORS:
+        return False
+    return all(char in IDENT_CHARS for char in token)
+
+
+def lex(expression):
+    """Split an expression into (token, position) pairs, rejecting unknown characters"""
     tokens = []
     position = 0
-    while position < hlp.string_length(expression):
-        char = hlp.get_char(expression, position)
-        if char == ' ':
+    length = hlp.string_length(expression)
+    while position < length:
+        char = expression[position]
+        if char.isspace():
             position += 1
-        elif valid_var(char):
-            tokens = hlp.add_item(tokens, char)
+        elif char in IDENT_START:
+            end = position + 1
+            while end < length and expression[end] in IDENT_CHARS:
+                end += 1
+            word = expression[position:end]
+            tokens.append((KEYWORD_OPERATORS.get(word, word), position))
+            position = end
+        elif char in CONSTANTS:
+            if position + 1 < length and expression[position + 1] in IDENT_CHARS:
+                raise ParseError(f"Invalid constant or name '{char}{expression[position + 1]}'", position)
+            tokens.append((char, position))
             position += 1
-        elif char == '-' and position + 1 < hlp.string_length(expression) and hlp.get_char(expression,
-                                                                                           position + 1) == '>':
-            tokens = hlp.add_item(tokens, '->')
+        elif char == '-':
+            if position + 1 >= length or expression[position + 1] != '>':
+                raise ParseError("Expected '->'", position)
+            tokens.append(('->', position))
             position += 2
-        elif char == '~':
-            tokens = hlp.add_item(tokens, '~')
+        elif char in '!~&|^()':
+            tokens.append((char, position))
             position += 1
-        elif char in '!&|()':
-            tokens = hlp.add_item(tokens, char)
+        elif char in SYMBOL_OPERATORS:
+            tokens.append((SYMBOL_OPERATORS[char], position))
             position += 1
         else:
-            position += 1
+            raise ParseError(f"Unexpected character '{char}'", position)
     return tokens
 
 
+def tokenize_input(expression):
+    return [token for token, _ in lex(expression)]
+
+
 def extract_vars(token_list):
     variables = []
+    seen = set()
     for token in token_list:
-        if valid_var(token) and not hlp.value_in_list(variables, token):
+        if valid_var(token) and not hlp.value_in_list(seen, token):
+            seen.add(token)
             variables = hlp.add_item(variables, token)
     return hlp.sort_list(variables)
 
@@ -43,7 +78,10 @@ def operator_priority(op):
     priorities = {
         '!': 4,
         '&': 3,
+        'nand': 3,
         '|': 2,
+        '^': 2,
+        'nor': 2,
         '->': 1,
         '~': 1
     }
@@ -55,7 +93,7 @@ def infix_to_postfix(tokens):
     stack = []
 
     for token in tokens:
-        if valid_var(token):
+        if valid_var(token) or token in CONSTANTS:
             output = hlp.add_item(output, token)
         elif token == '(':
             stack = hlp.add_item(stack, token)
@@ -63,6 +101,9 @@ def infix_to_postfix(tokens):
             while stack and stack[-1] != '(':
                 output = hlp.add_item(output, stack.pop())
             if stack: stack.pop()
+        elif token == '!':
+            # Prefix operator: nothing on the stack can be its operand yet
+            stack = hlp.add_item(stack, token)
         else:
             while stack and stack[-1] != '(' and operator_priority(stack[-1]) >= operator_priority(token):
                 output = hlp.add_item(output, stack.pop())
@@ -71,4 +112,182 @@ def infix_to_postfix(tokens):
     while stack:
         output = hlp.add_item(output, stack.pop())
 
-    return output
\ No newline at end of file
+    return output
+
+
+class Node:
+    """Immutable expression tree node.
+
+    Nodes made by one AstBuilder are hash-consed, so structurally equal
+    subexpressions are the same object and compare by identity.
+    """
+    __slots__ = ('op', 'children', 'name', 'uid')
+
+    def __init__(self, op, children, name, uid):
+        object.__setattr__(self, 'op', op)
+        object.__setattr__(self, 'children', children)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'uid', uid)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Node is immutable")
+
+    def __repr__(self):
+        if self.name is not None:
+            return f"Node({self.name!r})"
+        return f"Node({self.op!r}, {', '.join(map(repr, self.children))})"
+
+
+class AstBuilder:
+    """Factory that returns one shared node per distinct subexpression"""
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _intern(self, op, children, name=None):
+        key = (op, tuple(child.uid for child in children), name)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(op, children, name, len(self._nodes))
+            self._nodes[key] = node
+        return node
+
+    def var(self, name):
+        return self._intern('var', (), name)
+
+    def const(self, value):
+        return self._intern('const', (), str(int(value)))
+
+    def negate(self, child):
+        return self._intern('!', (child,))
+
+    def binary(self, op, left, right):
+        return self._intern(op, (left, right))
+
+
+class Parser:
+    """Recursive-descent parser producing a hash-consed Node tree.
+
+    Binary operators are left-associative; chains of operators of one
+    priority are parsed in a loop, so only parentheses add recursion depth.
+    """
+
+    def __init__(self, expression, builder=None):
+        self.expression = expression
+        self.tokens = lex(expression)
+        self.index = 0
+        self.builder = builder if builder is not None else AstBuilder()
+
+    def parse(self):
+        if not self.tokens:
+            raise ParseError("Empty expression", 0)
+        try:
+            node = self._binary(1)
+        except RecursionError:
+            raise ParseError("Expression is nested too deeply", self._position()) from None
+        if self.index < len(self.tokens):
+            token, position = self.tokens[self.index]
+            raise ParseError(f"Unexpected '{token}'", position)
+        return node
+
+    def _position(self):
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][1]
+        return hlp.string_length(self.expression)
+
+    def _peek(self):
+        return self.tokens[self.index][0] if self.index < len(self.tokens) else None
+
+    def _binary(self, priority):
+        if priority > 3:
+            return self._unary()
+        left = self._binary(priority + 1)
+        while operator_priority(self._peek()) == priority:
+            op = self._peek()
+            self.index += 1
+            right = self._binary(priority + 1)
+            left = self.builder.binary(op, left, right)
+        return left
+
+    def _unary(self):
+        negations = 0
+        while self._peek() == '!':
+            negations += 1
+            self.index += 1
+        node = self._primary()
+        for _ in range(negations):
+            node = self.builder.negate(node)
+        return node
+
+    def _primary(self):
+        token = self._peek()
+        position = self._position()
+        if token is None:
+            raise ParseError("Unexpected end of expression", position)
+        self.index += 1
+        if token == '(':
+            node = self._binary(1)
+            if self._peek() != ')':
+                raise ParseError("Expected ')'", self._position())
+            self.index += 1
+            return node
+        if token in CONSTANTS:
+            return self.builder.const(token)
+        if valid_var(token):
+            return self.builder.var(token)
+        raise ParseError(f"Unexpected '{token}'", position)
+
+
+def parse_expression(expression, builder=None):
+    """Parse an infix expression into a Node, sharing nodes through builder if given"""
+    return Parser(expression, builder).parse()
+
+
+def iter_nodes(root):
+    """Distinct nodes of a tree in post-order, children before parents"""
+    seen = set()
+    order = []
+    pending = [(root, False)]
+    while pending:
+        node, expanded = pending.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node.uid in seen:
+            continue
+        seen.add(node.uid)
+        pending.append((node, True))
+        for child in reversed(node.children):
+            if child.uid not in seen:
+                pending.append((child, False))
+    return order
+
+
+def node_variables(root):
+    return hlp.sort_list([node.name for node in iter_nodes(root) if node.op == 'var'])
+
+
+def to_postfix(root):
+    """Postfix token list of a tree in the infix_to_postfix format"""
+    output = []
+    pending = [(root, False)]
+    while pending:
+        node, expanded = pending.pop()
+        if node.name is not None:
+            output.append(node.name)
+        elif expanded:
+            output.append(node.op)
+        else:
+            pending.append((node, True))
+            for child in reversed(node.children):
+                pending.append((child, False))
+    return output
+
+
+def parse_postfix(expression):
+    """Sorted variables and postfix tokens of an infix expression, with syntax checking"""
+    root = parse_expression(expression)
+    return node_variables(root), to_postfix(root)
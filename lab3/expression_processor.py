@@ -1,5 +1,9 @@
 # expression_processor.py
+from collections.abc import Sequence
+from functools import lru_cache
+
 import helpers as hlp
+from expression_parser import CONSTANTS
 
 
 def compute_operator(op, x, y):
@@ -11,6 +15,12 @@ def compute_operator(op, x, y):
         return 0 if x and not y else 1
     if op == '~':
         return 1 if x == y else 0
+    if op == '^':
+        return x ^ y
+    if op == 'nand':
+        return 1 - (x & y)
+    if op == 'nor':
+        return 1 - (x | y)
     return 0
 
 
@@ -23,38 +33,214 @@ def compute_expression(expr, val_dict):
     idx = 0
     while idx < hlp.list_size(expr):
         token = expr[idx]
-        if token in 'abcde':
+        if token in val_dict:
             stack = hlp.add_item(stack, val_dict[token])
+        elif token in CONSTANTS:
+            stack = hlp.add_item(stack, int(token))
         elif token == '!':
-            top = stack[hlp.list_size(stack) - 1]
-            stack = stack[:hlp.list_size(stack) - 1]
-            stack = hlp.add_item(stack, invert_value(top))
+            stack = hlp.add_item(stack, invert_value(stack.pop()))
         else:
-            right = stack[hlp.list_size(stack) - 1]
-            stack = stack[:hlp.list_size(stack) - 1]
-            left = stack[hlp.list_size(stack) - 1]
-            stack = stack[:hlp.list_size(stack) - 1]
+            right = stack.pop()
+            left = stack.pop()
             stack = hlp.add_item(stack, compute_operator(token, left, right))
         idx += 1
     return stack[0]
 
 
+COMPILED_OPERATORS = {
+    '&': '{0} & {1}',
+    '|': '{0} | {1}',
+    '->': '(1 ^ {0}) | {1}',
+    '~': '1 ^ {0} ^ {1}',
+    '^': '{0} ^ {1}',
+    'nand': '1 ^ ({0} & {1})',
+    'nor': '1 ^ ({0} | {1})',
+}
+
+
+def compile_expression(expr, vars):
+    """Compile postfix expression into a function taking variable values positionally"""
+    return _compile_source(' '.join(expr), tuple(vars))
+
+
+@lru_cache(maxsize=256)
+def _compile_source(expr_string, vars):
+    args = ['v' + str(i) for i in range(len(vars))]
+    names = dict(zip(vars, args))
+    lines = []
+    stack = []
+    for token in expr_string.split():
+        if token in names:
+            stack.append(names[token])
+            continue
+        if token in CONSTANTS:
+            stack.append(token)
+            continue
+        if token == '!' and stack:
+            code = '1 ^ ' + stack.pop()
+        elif token in COMPILED_OPERATORS and len(stack) >= 2:
+            right = stack.pop()
+            left = stack.pop()
+            code = COMPILED_OPERATORS[token].format(left, right)
+        else:
+            raise ValueError(f"Cannot compile token: {token}")
+        temp = 't' + str(len(lines))
+        lines.append(f"    {temp} = {code}\n")
+        stack.append(temp)
+    if len(stack) != 1:
+        raise ValueError("Malformed postfix expression")
+
+    source = f"def compiled({', '.join(args)}):\n{''.join(lines)}    return {stack[0]}\n"
+    namespace = {}
+    exec(compile(source, '<expression>', 'exec'), namespace)
+    return namespace['compiled']
+
+
+def evaluate_many(expr, vars, assignments):
+    """Evaluate expression for each assignment given as a sequence of values in vars order"""
+    compiled = compile_expression(expr, vars)
+    return [compiled(*values) for values in assignments]
+
+
+def full_mask(num_vars):
+    """Mask with one bit for every row of a truth table over num_vars variables"""
+    return (1 << (1 << num_vars)) - 1
+
+
+def variable_column(position, num_vars):
+    """Packed column of a variable: bit i holds its value in truth table row i"""
+    block = 1 << (num_vars - position - 1)
+    column = ((1 << block) - 1) << block
+    width = block << 1
+    while width < 1 << num_vars:
+        column |= column << width
+        width <<= 1
+    return column
+
+
+def compute_column_operator(op, x, y, mask):
+    """Apply a binary operator to whole packed columns at once"""
+    if op == '&':
+        return x & y
+    if op == '|':
+        return x | y
+    if op == '->':
+        return (mask ^ x) | y
+    if op == '~':
+        return mask ^ x ^ y
+    if op == '^':
+        return x ^ y
+    if op == 'nand':
+        return mask ^ (x & y)
+    if op == 'nor':
+        return mask ^ (x | y)
+    return 0
+
+
+def compute_columns(expr, columns, mask):
+    """Evaluate postfix expression for all rows in one pass over the tokens"""
+    stack = []
+    for token in expr:
+        if token in columns:
+            stack.append(columns[token])
+        elif token in CONSTANTS:
+            stack.append(mask if token == '1' else 0)
+        elif token == '!':
+            stack.append(mask ^ stack.pop())
+        else:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(compute_column_operator(token, left, right, mask))
+    return stack[0]
+
+
+# Byte with its bit order reversed, for turning a packed column into an index
+_REVERSED_BYTES = bytes(int(f'{value:08b}'[::-1], 2) for value in range(256))
+
+
+def function_index(result_column, num_vars):
+    """Truth table index with row 0 as the most significant bit, as lab2's get_binary_index reads it"""
+    size = 1 << num_vars
+    num_bytes = (size + 7) >> 3
+    data = result_column.to_bytes(num_bytes, 'little').translate(_REVERSED_BYTES)
+    return int.from_bytes(data, 'big') >> ((num_bytes << 3) - size)
+
+
+class TruthTableView(Sequence):
+    """Read-only sequence of (combo, result) rows backed by a packed result column"""
+    __slots__ = ('result_column', 'num_vars')
+
+    def __init__(self, result_column, num_vars):
+        self.result_column = result_column
+        self.num_vars = num_vars
+
+    def __len__(self):
+        return 1 << self.num_vars
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("truth table row out of range")
+        return self.row_combo(index), (self.result_column >> index) & 1
+
+    def __iter__(self):
+        return zip(map(self.row_combo, range(len(self))), self.results())
+
+    def row_combo(self, index):
+        """Variable values of a row, most significant variable first"""
+        return [(index >> shift) & 1 for shift in range(self.num_vars - 1, -1, -1)]
+
+    def results(self):
+        """Iterate over result bits in row order"""
+        size = len(self)
+        data = self.result_column.to_bytes((size + 7) >> 3, 'little')
+        for index in range(size):
+            yield (data[index >> 3] >> (index & 7)) & 1
+
+    def count_ones(self):
+        return self.result_column.bit_count()
+
+
 def generate_truth_table(expr, vars):
-    outputs = []
-    combinations = 1 << hlp.list_size(vars)
+    num_vars = hlp.list_size(vars)
+    columns = {}
+    for position in range(num_vars):
+        columns[vars[position]] = variable_column(position, num_vars)
+    result = compute_columns(expr, columns, full_mask(num_vars))
+    return TruthTableView(result, num_vars)
+
+
+def iter_result_chunks(expr, vars, chunk_vars=16, chunks=None):
+    """Evaluate the truth table in chunks of 2^chunk_vars rows.
 
-    for i in range(combinations):
-        current_combo = []
-        for j in range(hlp.list_size(vars)):
-            shift_amount = hlp.list_size(vars) - j - 1
-            bit_val = (i >> shift_amount) & 1
-            current_combo = hlp.add_item(current_combo, bit_val)
+    Yields (first_row, row_count, packed_results) so memory stays bounded by the
+    chunk size rather than the table size. chunks limits the walk to a range
+    of chunk numbers.
+    """
+    num_vars = hlp.list_size(vars)
+    low = min(chunk_vars, num_vars)
+    high = num_vars - low
+    mask = full_mask(low)
+    columns = {}
+    for position in range(high, num_vars):
+        columns[vars[position]] = variable_column(position - high, low)
 
-        val_map = {}
-        for k in range(hlp.list_size(vars)):
-            val_map[vars[k]] = current_combo[k]
+    for chunk in range(1 << high) if chunks is None else chunks:
+        for position in range(high):
+            bit = (chunk >> (high - position - 1)) & 1
+            columns[vars[position]] = mask if bit else 0
+        yield chunk << low, 1 << low, compute_columns(expr, columns, mask)
 
-        res = compute_expression(expr, val_map)
-        outputs = hlp.add_item(outputs, (current_combo, res))
 
-    return outputs
\ No newline at end of file
+def iter_truth_table(expr, vars, chunk_vars=16):
+    """Yield (combo, result) rows one at a time without building the whole table"""
+    num_vars = hlp.list_size(vars)
+    for first_row, row_count, packed in iter_result_chunks(expr, vars, chunk_vars):
+        data = packed.to_bytes((row_count + 7) >> 3, 'little')
+        for offset in range(row_count):
+            index = first_row + offset
+            combo = [(index >> shift) & 1 for shift in range(num_vars - 1, -1, -1)]
+            yield combo, (data[offset >> 3] >> (offset & 7)) & 1
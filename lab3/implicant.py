@@ -0,0 +1,127 @@
+# implicant.py
+class Implicant:
+    """Product term stored as value and care bit masks over an ordered variable list.
+
+    The first variable owns the most significant bit, so a full minterm's value
+    equals its row index in the truth table.
+    """
+    __slots__ = ('value', 'care', 'variables')
+
+    def __init__(self, value, care, variables):
+        self.value = value & care
+        self.care = care
+        self.variables = variables
+
+    def __eq__(self, other):
+        if not isinstance(other, Implicant):
+            return NotImplemented
+        return (self.value == other.value and self.care == other.care
+                and self.variables == other.variables)
+
+    def __hash__(self):
+        return hash((self.value, self.care))
+
+    def __repr__(self):
+        return f"Implicant({self.pattern()!r})"
+
+    def pattern(self):
+        """Cube notation: 1, 0 or - for each variable"""
+        chars = []
+        for shift in range(len(self.variables) - 1, -1, -1):
+            if not (self.care >> shift) & 1:
+                chars.append('-')
+            else:
+                chars.append(str((self.value >> shift) & 1))
+        return "".join(chars)
+
+    def ones(self):
+        return self.value.bit_count()
+
+    def num_literals(self):
+        return self.care.bit_count()
+
+    def difference(self, other):
+        """Bit of the single differing variable, or 0 if terms cannot be combined"""
+        if self.care != other.care:
+            return 0
+        diff = self.value ^ other.value
+        return diff if diff and not diff & (diff - 1) else 0
+
+    def combine(self, diff):
+        """Drop the variable at bit diff"""
+        return Implicant(self.value & ~diff, self.care & ~diff, self.variables)
+
+    def covers(self, other):
+        """Check that every literal of this implicant appears in other"""
+        return (other.care & self.care == self.care
+                and not (other.value ^ self.value) & self.care)
+
+    def covers_index(self, index):
+        return not (index ^ self.value) & self.care
+
+    def minterms(self):
+        """Row indices covered by the implicant, in increasing order"""
+        free = ((1 << len(self.variables)) - 1) & ~self.care
+        subset = 0
+        while True:
+            yield self.value | subset
+            subset = (subset - free) & free
+            if not subset:
+                return
+
+    def to_term(self):
+        term = []
+        last = len(self.variables) - 1
+        for position, var in enumerate(self.variables):
+            shift = last - position
+            if (self.care >> shift) & 1:
+                term.append((var, (self.value >> shift) & 1))
+        return term
+
+    @classmethod
+    def from_term(cls, term, variables):
+        last = len(variables) - 1
+        positions = {var: last - i for i, var in enumerate(variables)}
+        value = care = 0
+        for var, val in term:
+            bit = 1 << positions[var]
+            care |= bit
+            if val:
+                value |= bit
+        return cls(value, care, variables)
+
+    @classmethod
+    def from_index(cls, index, variables):
+        return cls(index, (1 << len(variables)) - 1, variables)
+
+
+def term_variables(*term_lists):
+    """Sorted tuple of every variable used in the given term lists"""
+    names = set()
+    for terms in term_lists:
+        for term in terms:
+            if isinstance(term, Implicant):
+                names.update(term.variables)
+            else:
+                names.update(var for var, _ in term)
+    return tuple(sorted(names))
+
+
+def implicants_from_terms(terms, variables=None):
+    """Convert (var, value) tuple terms to implicants over a shared variable order"""
+    if variables is None:
+        variables = term_variables(terms)
+    variables = tuple(variables)
+    result = []
+    for term in terms:
+        if isinstance(term, Implicant):
+            if term.variables == variables:
+                result.append(term)
+                continue
+            term = term.to_term()
+        result.append(Implicant.from_term(term, variables))
+    return result
+
+
+def terms_from_implicants(implicants):
+    return [imp.to_term() for imp in implicants]
@@ -1,6 +1,14 @@
 import helpers as hlp
 import re
+from collections.abc import Sequence
+from functools import lru_cache
 from prettytable import PrettyTable
+from expression_parser import parse_postfix
+from expression_processor import generate_truth_table, full_mask
+from implicant import Implicant, term_variables, implicants_from_terms, terms_from_implicants
+from espresso import espresso_cover
+from cover_solver import CoverSolution, solve_cover, DEFAULT_TIME_BUDGET
+from parallel import combine_groups
 
 
 def create_minterms(table, variables, target_value):
@@ -15,6 +23,13 @@ def create_minterms(table, variables, target_value):
     return terms
 
 
+def create_implicants(table, variables, target_value):
+    """Create minterm or maxterm implicants straight from truth table row indices"""
+    variables = tuple(variables)
+    return [Implicant.from_index(index, variables)
+            for index, row in enumerate(table) if row[1] == target_value]
+
+
 def sort_term(term):
     """Sort variables in term alphabetically"""
     return sorted(term, key=lambda x: x[0])
@@ -51,6 +66,8 @@ def combine_terms(term, diff_var):
 
 def format_term(term, is_minterm):
     """Format term for display (using ¬ for negation)"""
+    if isinstance(term, Implicant):
+        term = term.to_term()
     if not term:
         return "1" if is_minterm else "0"
 
@@ -69,6 +86,8 @@ def format_term(term, is_minterm):
 
 def format_term_compact(term, is_minterm):
     """Format term for display (using ! for negation)"""
+    if isinstance(term, Implicant):
+        term = term.to_term()
     if not term:
         return "1" if is_minterm else "0"
 
@@ -103,6 +122,12 @@ def merge_terms(terms, operator):
 
 def is_covered(implicant, term):
     """Check if term is covered by implicant"""
+    if isinstance(implicant, Implicant):
+        if not isinstance(term, Implicant) or term.variables != implicant.variables:
+            term = Implicant.from_term(term, implicant.variables)
+        return implicant.covers(term)
+    if isinstance(term, Implicant):
+        term = term.to_term()
     for var, val in implicant:
         found = False
         for v, value in term:
@@ -116,151 +141,238 @@ def is_covered(implicant, term):
 
 def build_coverage_matrix(terms, implicants):
     """Build coverage matrix for prime implicants"""
+    (terms, implicants), _ = as_implicants(terms, implicants)
     return [
-        [1 if is_covered(imp, term) else 0
+        [1 if imp.covers(term) else 0
          for imp in implicants]
         for term in terms
     ]
 
 
-def quine_mccluskey(terms, is_minterm):
-    """Perform Quine-McCluskey minimization algorithm"""
+class StepLog(Sequence):
+    """Quine-McCluskey combination steps, formatted into strings only when read"""
+    __slots__ = ('records', 'is_minterm')
+
+    def __init__(self, is_minterm):
+        self.records = []
+        self.is_minterm = is_minterm
+
+    def add(self, step_num, term1, term2, combined):
+        self.records.append((step_num, term1, term2, combined))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        step_num, term1, term2, combined = self.records[index]
+        return (
+            f"Step {step_num}: Combine {format_term(term1, self.is_minterm)} "
+            f"and {format_term(term2, self.is_minterm)} → "
+            f"{format_term(combined, self.is_minterm)}"
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def quine_mccluskey(terms, is_minterm, workers=1):
+    """Perform Quine-McCluskey minimization algorithm.
+
+    With workers > 1, large rounds compare adjacent groups in worker processes;
+    results and steps come out in the same order as a serial run. Steps are a
+    StepLog, so their strings are only built if someone reads them.
+    """
     if not terms:
-        return [], []
+        return [], StepLog(is_minterm)
 
-    prime_implicants = []
-    current_terms = remove_duplicates(terms)
-    steps = []
+    (current_terms,), as_terms = as_implicants(terms)
+    current_terms = remove_duplicates(current_terms)
+    prime_implicants = {}
+    steps = StepLog(is_minterm)
     step_num = 1
 
     while True:
-        next_terms = []
-        marked = [False] * len(current_terms)
-        changed = False
-
-        for i in range(len(current_terms)):
-            for j in range(i + 1, len(current_terms)):
-                term1 = current_terms[i]
-                term2 = current_terms[j]
-                can_combine_res, diff_var = can_combine(term1, term2)
-
-                if can_combine_res:
-                    combined = combine_terms(term1, diff_var)
-                    if not contains_term(next_terms, combined):
-                        next_terms.append(combined)
-                        steps.append(
-                            f"Step {step_num}: Combine {format_term(term1, is_minterm)} "
-                            f"and {format_term(term2, is_minterm)} → "
-                            f"{format_term(combined, is_minterm)}"
-                        )
-                    marked[i] = marked[j] = True
-                    changed = True
+        # Only terms with equal care masks and one-count differing by one can combine
+        groups = {}
+        for term in current_terms:
+            groups.setdefault((term.care, term.ones()), []).append(term)
+
+        adjacent = [(group, groups[(care, ones + 1)]) for (care, ones), group in groups.items()
+                    if (care, ones + 1) in groups]
+        tasks = [([term.value for term in group], [term.value for term in upper]) for group, upper in adjacent]
+
+        next_terms = {}
+        marked = set()
+        for (group, upper), pairs in zip(adjacent, combine_groups(tasks, workers)):
+            for i, j, diff in pairs:
+                term1, term2 = group[i], upper[j]
+                combined = term1.combine(diff)
+                if combined not in next_terms:
+                    next_terms[combined] = None
+                    steps.add(step_num, term1, term2, combined)
+                marked.add(term1)
+                marked.add(term2)
 
         # Add unmarked terms to prime implicants
-        for i, term in enumerate(current_terms):
-            if not marked[i] and not contains_term(prime_implicants, term):
-                prime_implicants.append(term)
+        for term in current_terms:
+            if term not in marked:
+                prime_implicants[term] = None
 
-        if not changed:
+        if not next_terms:
             break
 
-        current_terms = remove_duplicates(next_terms)
+        current_terms = list(next_terms)
         step_num += 1
 
-    return prime_implicants, steps
+    prime_implicants = list(prime_implicants)
+    return (terms_from_implicants(prime_implicants) if as_terms else prime_implicants), steps
 
 
-def select_prime_implicants(terms, prime_implicants):
-    """Select essential prime implicants using coverage matrix"""
+def solve_prime_cover(terms, prime_implicants, time_budget=DEFAULT_TIME_BUDGET):
+    """Find a minimum cover of terms by prime implicants.
+
+    Fewer implicants win first, then fewer literals. The returned solution's cost
+    is the implicant count and optimal tells whether minimality was proven
+    within the time budget.
+    """
     if not terms or not prime_implicants:
-        return []
+        return CoverSolution()
 
-    coverage = build_coverage_matrix(terms, prime_implicants)
-    uncovered_indices = list(range(len(terms)))
-    selected = []
-
-    while uncovered_indices:
-        # Find essential prime implicants
-        essential_found = False
-        for i in uncovered_indices[:]:
-            covering = [
-                j for j in range(len(prime_implicants))
-                if coverage[i][j] == 1 and
-                   not contains_term(selected, prime_implicants[j])
-            ]
-
-            if len(covering) == 1:
-                selected.append(prime_implicants[covering[0]])
-                essential_found = True
-                # Remove covered terms
-                uncovered_indices = [
-                    idx for idx in uncovered_indices
-                    if not coverage[idx][covering[0]]
-                ]  # Fixed this line
-                break
+    (terms, prime_implicants), as_terms = as_implicants(terms, prime_implicants)
+    prime_implicants = remove_duplicates(prime_implicants)
+    columns = [0] * len(prime_implicants)
+    for i, term in enumerate(terms):
+        for j, imp in enumerate(prime_implicants):
+            if imp.covers(term):
+                columns[j] |= 1 << i
 
-        if essential_found:
-            continue
+    universe = 0
+    for column in columns:
+        universe |= column
+    literals = [imp.num_literals() for imp in prime_implicants]
+    scale = sum(literals) + 1
+    solution = solve_cover(columns, universe, [scale + count for count in literals], time_budget)
 
-        # If no essential found, use greedy selection
-        best_imp = None
-        max_cover = 0
-        for j in range(len(prime_implicants)):
-            if contains_term(selected, prime_implicants[j]):
-                continue
+    selected = sorted((prime_implicants[j] for j in solution.selected), key=cube_order)
+    return CoverSolution(
+        terms_from_implicants(selected) if as_terms else selected,
+        len(selected),
+        solution.optimal,
+        sum(literals[j] for j in solution.selected),
+    )
 
-            cover_count = sum(
-                1 for idx in uncovered_indices
-                if coverage[idx][j] == 1
-            )
 
-            if cover_count > max_cover:
-                max_cover = cover_count
-                best_imp = prime_implicants[j]
+def cube_order(imp):
+    """Sort key for printed covers: cubes on earlier variables first, negated literals first"""
+    return -imp.care, imp.value
 
-        if best_imp is None:
-            break
 
-        selected.append(best_imp)
-        uncovered_indices = [
-            idx for idx in uncovered_indices
-            if not any(
-                coverage[idx][j] == 1 and
-                terms_equal(prime_implicants[j], best_imp)
-                for j in range(len(prime_implicants))
-            )
-        ]
+def select_prime_implicants(terms, prime_implicants):
+    """Select a minimal set of prime implicants covering all terms"""
+    return solve_prime_cover(terms, prime_implicants).selected
+
+
+def resolve_dont_cares(dont_cares, variables):
+    """Turn a don't-care specification into minterm implicants over variables.
+
+    dont_cares is either a list of row indices or terms, or a care expression
+    whose false rows are the don't-care conditions.
+    """
+    variables = tuple(variables)
+    if not dont_cares:
+        return []
 
-    return remove_duplicates(selected)
+    if isinstance(dont_cares, str):
+        care_vars, postfix = parse_postfix(dont_cares)
+        unknown = [var for var in care_vars if var not in variables]
+        if unknown:
+            raise ValueError(f"Care expression uses unknown variables: {', '.join(unknown)}")
+        care = generate_truth_table(postfix, list(variables)).result_column
+        dont_care_rows = full_mask(len(variables)) & ~care
+        return [Implicant.from_index(index, variables)
+                for index in range(1 << len(variables)) if (dont_care_rows >> index) & 1]
+
+    result = {}
+    for item in dont_cares:
+        if isinstance(item, int):
+            if not 0 <= item < 1 << len(variables):
+                raise ValueError(f"Don't-care row out of range: {item}")
+            result[Implicant.from_index(item, variables)] = None
+        else:
+            for cube in implicants_from_terms([item], variables):
+                for index in cube.minterms():
+                    result[Implicant.from_index(index, variables)] = None
+    return list(result)
 
 
-def minimize_expression(terms, is_minterm):
-    """Minimize expression using Quine-McCluskey algorithm"""
-    prime_implicants, steps = quine_mccluskey(terms, is_minterm)
+def dont_care_terms(dont_cares, *term_lists):
+    """Resolve don't-cares in the representation of the given term lists, skipping their terms"""
+    if not dont_cares:
+        return []
+    items = [term for terms in term_lists for term in terms]
+    as_terms = not items or not all(isinstance(term, Implicant) for term in items)
+    variables = term_variables(*term_lists) if as_terms else items[0].variables
+    known = set(implicants_from_terms(items, variables))
+    extra = [imp for imp in resolve_dont_cares(dont_cares, variables) if imp not in known]
+    return terms_from_implicants(extra) if as_terms else extra
+
+
+def minimize_expression(terms, is_minterm, method='qm', dont_cares=None, workers=1):
+    """Minimize expression using Quine-McCluskey algorithm or the Espresso heuristic.
+
+    Don't-care rows take part in combining but do not have to be covered.
+    workers is passed on to quine_mccluskey.
+    """
+    if method not in ('qm', 'espresso'):
+        raise ValueError(f"Unknown minimization method: {method}")
+    dc_terms = dont_care_terms(dont_cares, terms) if terms else []
+
+    if method == 'espresso':
+        if not terms:
+            return [], []
+        (implicants, dc_implicants), as_terms = as_implicants(terms, dc_terms)
+        minimized, steps = espresso_cover(implicants, dc_cover=dc_implicants)
+        return (terms_from_implicants(minimized) if as_terms else minimized), steps
+
+    prime_implicants, steps = quine_mccluskey(list(terms) + dc_terms, is_minterm, workers)
     minimized = select_prime_implicants(terms, prime_implicants)
     return minimized, steps
 
 
-def minimize_with_table(terms, is_minterm, original_terms):
+def minimize_with_table(terms, is_minterm, original_terms, dont_cares=None):
     """Minimize expression and return coverage table"""
-    prime_implicants, steps = quine_mccluskey(terms, is_minterm)
+    dc_terms = dont_care_terms(dont_cares, terms, original_terms) if terms else []
+    prime_implicants, steps = quine_mccluskey(list(terms) + dc_terms, is_minterm)
     minimized = select_prime_implicants(original_terms, prime_implicants)
+    return minimized, steps, coverage_table(original_terms, prime_implicants, is_minterm)
 
+
+def coverage_table(terms, prime_implicants, is_minterm):
+    """Rows of the prime implicant chart, header first"""
     table = []
-    if prime_implicants and original_terms:
+    # Implicants made only of don't-care rows have nothing to cover
+    prime_implicants = [imp for imp in prime_implicants
+                        if any(is_covered(imp, term) for term in terms)]
+    if prime_implicants and terms:
         # Build header
         header = ["Term"]
         header += [format_term_compact(imp, is_minterm) for imp in prime_implicants]
         table.append(header)
 
         # Build rows
-        for term in original_terms:
+        for term in terms:
             row = [format_term_compact(term, is_minterm)]
             row += ["X" if is_covered(imp, term) else "."
                     for imp in prime_implicants]
             table.append(row)
 
-    return minimized, steps, table
+    return table
 
 
 def get_kmap_dimensions(num_vars):
@@ -275,22 +387,73 @@ def get_kmap_dimensions(num_vars):
         return 4, 4, 2, 2
     elif num_vars == 5:  # Добавлена поддержка 5 переменных
         return 4, 8, 2, 3  # 4 строки, 8 столбцов
+    elif num_vars == 6:
+        return 8, 8, 3, 3
     else:
         return None, None, None, None
 
 
+@lru_cache(maxsize=None)
+def _gray_codes(n):
+    return tuple(format(i ^ (i >> 1), f'0{n}b') if n else "" for i in range(1 << n))
+
+
 def gray_code(n):
     """Generate Gray codes for n bits"""
-    if n == 0:
-        return [""]
-    if n == 1:
-        return ["0", "1"]
-    prev = gray_code(n - 1)
-    return ["0" + code for code in prev] + ["1" + code for code in prev[::-1]]
+    return list(_gray_codes(n))
+
+
+@lru_cache(maxsize=None)
+def gray_positions(n):
+    """Lookup table from an n-bit value to its position in the Gray code sequence"""
+    positions = [0] * (1 << n)
+    for position in range(1 << n):
+        positions[position ^ (position >> 1)] = position
+    return tuple(positions)
+
+
+@lru_cache(maxsize=None)
+def kmap_cubes(num_vars):
+    """Every cube over num_vars bits as (value, care, cell mask), largest first.
+
+    On a Gray-coded map each cube is a rectangle of 2^k cells, wrapping around
+    the edges (and mirrored across the halves of a 3-bit axis).
+    """
+    cubes = []
+    for care in range(1 << num_vars):
+        cells = [index for index in range(1 << num_vars) if index & care == 0]
+        value = care
+        while True:
+            mask = 0
+            for cell in cells:
+                mask |= 1 << (value | cell)
+            cubes.append((value, care, mask))
+            if value == 0:
+                break
+            value = (value - 1) & care
+    cubes.sort(key=lambda cube: (cube[1].bit_count(), cube[1], cube[0]))
+    return tuple(cubes)
+
+
+def find_kmap_groups(on_cells, dc_cells, num_vars):
+    """Largest rectangles of the map made of 1 and X cells that contain at least one 1.
+
+    Cells are packed as bits of row indices. A rectangle is kept unless it
+    lies inside a bigger one already found.
+    """
+    allowed = on_cells | dc_cells
+    groups = []
+    for value, care, mask in kmap_cubes(num_vars):
+        if mask & ~allowed or not mask & on_cells:
+            continue
+        if any(mask & ~group_mask == 0 for _, _, group_mask in groups):
+            continue
+        groups.append((value, care, mask))
+    return groups
 
 
-def create_karnaugh_map(terms, variables, is_minterm):
-    """Create Karnaugh map for given terms"""
+def create_karnaugh_map(terms, variables, is_minterm, dont_cares=None):
+    """Create Karnaugh map for given terms, marking don't-care cells with X"""
     num_vars = len(variables)
     rows, cols, row_vars, col_vars = get_kmap_dimensions(num_vars)
     if rows is None:
@@ -298,40 +461,19 @@ def create_karnaugh_map(terms, variables, is_minterm):
 
     # Initialize map with 0s (for minterms) or 1s (for maxterms)
     kmap = [[0 if is_minterm else 1 for _ in range(cols)] for _ in range(rows)]
+    row_positions = gray_positions(row_vars)
+    col_positions = gray_positions(col_vars)
+    col_mask = (1 << col_vars) - 1
 
-    # Generate Gray codes for rows and columns
-    row_codes = gray_code(row_vars)
-    col_codes = gray_code(col_vars)
-
-    # Fill the map
-    for term in terms:
-        row_bits = []
-        col_bits = []
-        for var in variables:
-            val = None
-            for v, value in term:
-                if v == var:
-                    val = value
-                    break
-            if val is None:
-                continue
-
-            if len(row_bits) < row_vars:
-                row_bits.append(str(val))
-            else:
-                col_bits.append(str(val))
-
-        row_str = "".join(row_bits)
-        col_str = "".join(col_bits)
-
-        try:
-            row_idx = row_codes.index(row_str) if row_vars > 0 else 0
-            col_idx = col_codes.index(col_str)
-            kmap[row_idx][col_idx] = 1 if is_minterm else 0
-        except ValueError:
-            continue
+    # Fill the map; terms are written last so they win over don't-cares
+    variables = tuple(variables)
+    marked = [(imp, "X") for imp in resolve_dont_cares(dont_cares, variables)]
+    marked += [(imp, 1 if is_minterm else 0) for imp in implicants_from_terms(terms, variables)]
+    for imp, mark in marked:
+        for index in imp.minterms():
+            kmap[row_positions[index >> col_vars]][col_positions[index & col_mask]] = mark
 
-    return kmap, (row_codes, col_codes, row_vars, col_vars, variables)
+    return kmap, (gray_code(row_vars), gray_code(col_vars), row_vars, col_vars, variables)
 
 
 def format_kmap_for_display(kmap, params):
@@ -360,27 +502,80 @@ def format_kmap_for_display(kmap, params):
     return pt
 
 
-def minimize_with_kmap(terms, is_minterm, variables):
-    """Minimize using Karnaugh map method"""
-    kmap, params = create_karnaugh_map(terms, variables, is_minterm)
-    minimized, steps = minimize_expression(terms, is_minterm)
+def minimize_with_kmap(terms, is_minterm, variables, dont_cares=None):
+    """Minimize using Karnaugh map method.
 
+    Maps over more than six variables are not drawn and the expression is
+    minimized with Quine-McCluskey.
+    """
+    kmap, params = create_karnaugh_map(terms, variables, is_minterm, dont_cares)
+    minimized, steps = kmap_minimize(terms, is_minterm, variables, dont_cares)
     if kmap is None:
         return minimized, steps, [["Karnaugh map not supported for this number of variables"]]
-
     return minimized, steps, format_kmap_for_display(kmap, params)
 
 
+def kmap_minimize(terms, is_minterm, variables, dont_cares=None):
+    """Minimized terms and group steps read off the Karnaugh map, without drawing it.
+
+    Groups are the largest rectangles of the map; the fewest groups (then
+    literals) covering every marked cell are chosen.
+    """
+    if get_kmap_dimensions(len(variables))[0] is None:
+        return minimize_expression(terms, is_minterm, dont_cares=dont_cares)
+    if not terms:
+        return [], []
+
+    variables = tuple(variables)
+    as_terms = not all(isinstance(term, Implicant) for term in terms)
+    on_cells = dc_cells = 0
+    for imp in implicants_from_terms(terms, variables):
+        for index in imp.minterms():
+            on_cells |= 1 << index
+    for imp in resolve_dont_cares(dont_cares, variables):
+        for index in imp.minterms():
+            dc_cells |= 1 << index
+    dc_cells &= ~on_cells
+
+    groups = find_kmap_groups(on_cells, dc_cells, len(variables))
+    implicants = [Implicant(value, care, variables) for value, care, _ in groups]
+    literals = [imp.num_literals() for imp in implicants]
+    scale = sum(literals) + 1
+    solution = solve_cover([mask & on_cells for _, _, mask in groups], on_cells,
+                           [scale + count for count in literals])
+
+    minimized = sorted((implicants[j] for j in solution.selected), key=cube_order)
+    steps = [
+        f"Group {number}: {1 << (len(variables) - imp.num_literals())} cells → {format_term(imp, is_minterm)}"
+        for number, imp in enumerate(minimized, 1)
+    ]
+    return (terms_from_implicants(minimized) if as_terms else minimized), steps
+
+
 # Helper functions
+def as_implicants(*term_lists):
+    """Convert term lists to implicants over one variable order.
+
+    Returns the converted lists and whether the input used (var, value) tuples,
+    so callers can hand results back in the form they received.
+    """
+    items = [term for terms in term_lists for term in terms]
+    if items and all(isinstance(term, Implicant) and term.variables == items[0].variables
+                     for term in items):
+        return [list(terms) for terms in term_lists], False
+    variables = term_variables(*term_lists)
+    return [implicants_from_terms(terms, variables) for terms in term_lists], True
+
+
 def remove_duplicates(terms):
     """Remove duplicate terms"""
-    unique = []
-    for term in terms:
-        if not contains_term(unique, term):
-            unique.append(term)
-    return unique
+    if all(isinstance(term, Implicant) for term in terms):
+        return list(dict.fromkeys(terms))
+    return hlp.unique_terms(terms)
 
 
 def contains_term(term_list, term):
     """Check if term exists in list"""
-    return any(terms_equal(t, term) for t in term_list)
+    if isinstance(term, Implicant):
+        return term in term_list
+    return hlp.term_exists(term_list, term)
@@ -1,18 +1,10 @@
-from expression_parser import tokenize_input, extract_vars, infix_to_postfix
-from expression_processor import generate_truth_table
-from logic_minimizer import (create_minterms, minimize_expression, minimize_with_table,
-merge_terms, minimize_with_kmap,format_term_compact)
+import argparse
+
+from analysis import analyze, join_form
 import helpers as hlp
 from prettytable import PrettyTable
-
-
-def display_truth_table(table, variables, expression):
-    pt = PrettyTable()
-    pt.field_names = variables + [expression]
-    for row in table:
-        pt.add_row(list(row[0]) + [row[1]])
-    print("\n=== TRUTH TABLE ===")
-    print(pt)
+from npn import DEFAULT_CLASSES
+from result_cache import DEFAULT_CACHE, ResultCache
 
 
 def display_original_forms(sdnf, sknf):
@@ -63,93 +55,99 @@ def display_kmap(title, kmap, result):
     print(f"\nMinimized form: {result}")
 
 
-def check_trivial_cases(table):
-    all_zeros = all(row[1] == 0 for row in table)
-    all_ones = all(row[1] == 1 for row in table)
-
-    if all_zeros:
+def report_constant(constant):
+    if constant == 0:
         print("\nThe function is always FALSE (0)")
         return True
-    elif all_ones:
+    elif constant == 1:
         print("\nThe function is always TRUE (1)")
         return True
     return False
 
 
-def run_program():
-    print("=== LOGIC EXPRESSION MINIMIZER ===")
-    expression = input("Enter logical expression: ")
+SECTIONS = ('truth-table', 'forms', 'qm', 'coverage', 'kmap', 'sdnf', 'sknf')
+REPORT_SECTIONS = ('truth-table', 'forms', 'qm', 'coverage', 'kmap')
+
+
+def parse_sections(value):
+    sections = [section.strip() for section in value.split(',') if section.strip()]
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown or not sections:
+        raise argparse.ArgumentTypeError(
+            f"unknown section(s): {', '.join(unknown) or value!r}; choose from {', '.join(SECTIONS)}")
+    return sections
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Minimize a logical expression")
+    parser.add_argument('expression', nargs='?', help="expression to minimize; asked for if omitted")
+    parser.add_argument('--only', type=parse_sections, default=None, metavar='SECTIONS',
+                        help=f"comma-separated sections to print: {', '.join(SECTIONS)}")
+    parser.add_argument('--cache', default=None, metavar='PATH',
+                        help="sqlite file keeping minimized forms between runs")
+    parser.add_argument('--npn', action='store_true',
+                        help="share minimized forms between functions equal up to renamed or negated variables")
+    return parser.parse_args(argv)
+
+
+def run_program(argv=None):
+    args = parse_args(argv)
+    full_report = args.only is None
+    sections = REPORT_SECTIONS if full_report else args.only
+    if full_report:
+        print("=== LOGIC EXPRESSION MINIMIZER ===")
+    expression = args.expression if args.expression is not None else input("Enter logical expression: ")
+    cache = ResultCache(path=args.cache) if args.cache is not None else DEFAULT_CACHE
 
     try:
-        # Parse and validate input
-        tokens = tokenize_input(expression)
-        variables = extract_vars(tokens)
-        variables = hlp.sort_list(variables)
+        # Parse and validate input; everything else is computed on first access
+        result = analyze(expression, cache, DEFAULT_CLASSES if args.npn else None)
+        variables = result.variables
 
-        if hlp.list_size(variables) > 3:
-            print("\nWarning: Karnaugh maps are only supported for up to 3 variables")
+        if 'kmap' in sections and hlp.list_size(variables) > 6:
+            print("\nWarning: Karnaugh maps are only supported for up to 6 variables")
         if not variables:
             print("Error: No variables found in expression")
             return
 
-        # Generate truth table
-        postfix = infix_to_postfix(tokens)
-        truth_table = generate_truth_table(postfix, variables)
+        if 'truth-table' in sections:
+            print("\n=== TRUTH TABLE ===")
+            print(result.truth_table_display)
 
-        # Display truth table
-        display_truth_table(truth_table, variables, expression)
+        # Short answers for callers that only want the minimized forms
+        if 'sdnf' in sections:
+            print(result.sdnf_minimized if result.constant is None else result.constant)
+        if 'sknf' in sections:
+            print(result.sknf_minimized if result.constant is None else result.constant)
 
         # Check for trivial cases
-        if check_trivial_cases(truth_table):
+        if not (set(sections) & {'forms', 'qm', 'coverage', 'kmap'}) or report_constant(result.constant):
             return
 
-        # Create canonical forms
-        minterms = create_minterms(truth_table, variables, 1)
-        maxterms = create_minterms(truth_table, variables, 0)
-
-        # Original forms
-        sdnf_initial = merge_terms([format_term_compact(t, True) for t in minterms], " ∨ ") if minterms else "0"
-        sknf_initial = merge_terms([format_term_compact(t, False) for t in maxterms], " ∧ ") if maxterms else "1"
-        display_original_forms(sdnf_initial, sknf_initial)
-
-        # SDNF Minimization
-        min_sdnf, sdnf_steps = minimize_expression(minterms, True)
-        sdnf_result = merge_terms([format_term_compact(t, True) for t in min_sdnf], " ∨ ") if min_sdnf else "0"
-        display_minimization("SDNF MINIMIZATION (CALCULATION)", sdnf_steps, sdnf_result)
-
-        # SKNF Minimization
-        min_sknf, sknf_steps = minimize_expression(maxterms, False)
-        sknf_result = merge_terms([format_term_compact(t, False) for t in min_sknf], " ∧ ") if min_sknf else "1"
-        display_minimization("SKNF MINIMIZATION (CALCULATION)", sknf_steps, sknf_result)
-
-        # SDNF Table Method
-        min_sdnf_tbl, sdnf_tbl_steps, sdnf_table = minimize_with_table(minterms, True, minterms)
-        sdnf_tbl_result = merge_terms([format_term_compact(t, True) for t in min_sdnf_tbl],
-                                      " ∨ ") if min_sdnf_tbl else "0"
-        display_coverage("SDNF TABLE METHOD", sdnf_tbl_steps, sdnf_table, sdnf_tbl_result)
-
-        # SKNF Table Method
-        min_sknf_tbl, sknf_tbl_steps, sknf_table = minimize_with_table(maxterms, False, maxterms)
-        sknf_tbl_result = merge_terms([format_term_compact(t, False) for t in min_sknf_tbl],
-                                      " ∧ ") if min_sknf_tbl else "1"
-        display_coverage("SKNF TABLE METHOD", sknf_tbl_steps, sknf_table, sknf_tbl_result)
-
-        # SDNF Karnaugh Map
-        min_sdnf_kmap, sdnf_kmap_steps, sdnf_kmap = minimize_with_kmap(minterms, True, variables)
-        sdnf_kmap_result = merge_terms([format_term_compact(t, True) for t in min_sdnf_kmap],
-                                       " ∨ ") if min_sdnf_kmap else "0"
-        display_kmap("SDNF KARNAUGH MAP", sdnf_kmap, sdnf_kmap_result)
-
-        # SKNF Karnaugh Map
-        min_sknf_kmap, sknf_kmap_steps, sknf_kmap = minimize_with_kmap(maxterms, False, variables)
-        sknf_kmap_result = merge_terms([format_term_compact(t, False) for t in min_sknf_kmap],
-                                       " ∧ ") if min_sknf_kmap else "1"
-        display_kmap("SKNF KARNAUGH MAP", sknf_kmap, sknf_kmap_result)
+        if 'forms' in sections:
+            display_original_forms(result.sdnf, result.sknf)
+
+        if 'qm' in sections:
+            display_minimization("SDNF MINIMIZATION (CALCULATION)", result.sdnf_primes[1], result.sdnf_minimized)
+            display_minimization("SKNF MINIMIZATION (CALCULATION)", result.sknf_primes[1], result.sknf_minimized)
+
+        if 'coverage' in sections:
+            display_coverage("SDNF TABLE METHOD", result.sdnf_primes[1], result.sdnf_coverage,
+                             result.sdnf_minimized)
+            display_coverage("SKNF TABLE METHOD", result.sknf_primes[1], result.sknf_coverage,
+                             result.sknf_minimized)
+
+        if 'kmap' in sections:
+            display_kmap("SDNF KARNAUGH MAP", result.sdnf_kmap_display, join_form(result.sdnf_kmap[0], True))
+            display_kmap("SKNF KARNAUGH MAP", result.sknf_kmap_display, join_form(result.sknf_kmap[0], False))
 
     except Exception as e:
         print(f"\nERROR: {str(e)}")
     finally:
-        print("\n=== PROGRAM FINISHED ===")
+        if cache is not DEFAULT_CACHE:
+            cache.close()
+        if full_report:
+            print("\n=== PROGRAM FINISHED ===")
 
 
 if __name__ == "__main__":
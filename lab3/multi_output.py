@@ -0,0 +1,153 @@
+# multi_output.py
+from dataclasses import dataclass, field
+
+from cover_solver import solve_cover, DEFAULT_TIME_BUDGET
+from expression_parser import parse_postfix
+from expression_processor import generate_truth_table
+from implicant import Implicant
+from logic_minimizer import format_term_compact, merge_terms
+
+
+@dataclass
+class MultiOutputResult:
+    """Minimized sum-of-products covers of several functions sharing product terms"""
+    variables: tuple
+    expressions: list
+    outputs: list = field(default_factory=list)
+    total_terms: int = 0
+    shared_terms: int = 0
+    optimal: bool = True
+
+    def format_output(self, index):
+        terms = [format_term_compact(imp, True) for imp in self.outputs[index]]
+        return merge_terms(terms, " ∨ ") if terms else "0"
+
+
+def tagged_prime_implicants(on_sets, num_vars):
+    """Quine-McCluskey over minterms tagged with the outputs they belong to.
+
+    Returns a dict mapping (value, care) to the bitmask of outputs whose on-set
+    contains the whole cube. A cube is kept only if no larger cube serves the
+    same outputs.
+    """
+    care = (1 << num_vars) - 1
+    current = {}
+    for index in range(1 << num_vars):
+        tag = 0
+        for k, on_set in enumerate(on_sets):
+            if (on_set >> index) & 1:
+                tag |= 1 << k
+        if tag:
+            current[(index, care)] = tag
+
+    primes = {}
+    while current:
+        groups = {}
+        for value, cube_care in current:
+            groups.setdefault((cube_care, value.bit_count()), []).append(value)
+
+        combined = {}
+        marked = set()
+        for (cube_care, ones), group in groups.items():
+            upper = groups.get((cube_care, ones + 1))
+            if not upper:
+                continue
+            for value1 in group:
+                tag1 = current[(value1, cube_care)]
+                for value2 in upper:
+                    diff = value1 ^ value2
+                    if diff & (diff - 1):
+                        continue
+                    tag2 = current[(value2, cube_care)]
+                    tag = tag1 & tag2
+                    if not tag:
+                        continue
+                    combined[(value1, cube_care & ~diff)] = tag
+                    if tag == tag1:
+                        marked.add((value1, cube_care))
+                    if tag == tag2:
+                        marked.add((value2, cube_care))
+
+        for key, tag in current.items():
+            if key not in marked:
+                primes[key] = tag
+        current = combined
+    return primes
+
+
+def minimize_multi_output(expressions, variables=None, time_budget=DEFAULT_TIME_BUDGET):
+    """Minimize several expressions over a common variable set with shared product terms.
+
+    Prime implicants are computed once for all outputs and a single cover is
+    chosen for every (output, minterm) pair, so a product term used by several
+    outputs is paid for only once.
+    """
+    postfixes = []
+    names = set()
+    for expression in expressions:
+        expression_vars, postfix = parse_postfix(expression)
+        names.update(expression_vars)
+        postfixes.append(postfix)
+    variables = tuple(variables) if variables is not None else tuple(sorted(names))
+    missing = names - set(variables)
+    if missing:
+        raise ValueError(f"Variables missing from the common set: {', '.join(sorted(missing))}")
+
+    num_vars = len(variables)
+    on_sets = [generate_truth_table(postfix, list(variables)).result_column for postfix in postfixes]
+    primes = tagged_prime_implicants(on_sets, num_vars)
+    keys = sorted(primes)
+    implicants = [Implicant(value, care, variables) for value, care in keys]
+
+    # One cover row per (output, minterm) pair
+    row_of = {}
+    for k, on_set in enumerate(on_sets):
+        for index in range(1 << num_vars):
+            if (on_set >> index) & 1:
+                row_of[(k, index)] = len(row_of)
+
+    columns = []
+    for key, imp in zip(keys, implicants):
+        tag = primes[key]
+        column = 0
+        for index in imp.minterms():
+            for k in range(len(on_sets)):
+                if (tag >> k) & 1:
+                    column |= 1 << row_of[(k, index)]
+        columns.append(column)
+
+    literals = [imp.num_literals() for imp in implicants]
+    scale = sum(literals) + 1
+    universe = (1 << len(row_of)) - 1
+    solution = solve_cover(columns, universe, [scale + count for count in literals], time_budget)
+
+    # Each output keeps a minimal subset of the shared terms that covers it
+    outputs = []
+    usage = {}
+    optimal = solution.optimal
+    for k in range(len(on_sets)):
+        candidates = [j for j in solution.selected if (primes[keys[j]] >> k) & 1]
+        output_columns = [0] * len(candidates)
+        output_universe = 0
+        for position, j in enumerate(candidates):
+            for index in implicants[j].minterms():
+                if (k, index) in row_of:
+                    output_columns[position] |= 1 << index
+            output_universe |= output_columns[position]
+        chosen = solve_cover(output_columns, output_universe, time_budget=time_budget) \
+            if candidates else None
+        selected = [candidates[position] for position in chosen.selected] if chosen else []
+        if chosen and not chosen.optimal:
+            optimal = False
+        for j in selected:
+            usage[j] = usage.get(j, 0) + 1
+        outputs.append([implicants[j] for j in selected])
+
+    return MultiOutputResult(
+        variables,
+        list(expressions),
+        outputs,
+        len(usage),
+        sum(1 for count in usage.values() if count > 1),
+        optimal,
+    )
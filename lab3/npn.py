@@ -0,0 +1,209 @@
+# npn.py
+from dataclasses import dataclass
+from itertools import permutations, product
+
+from expression_processor import full_mask, variable_column, TruthTableView
+from implicant import Implicant
+from logic_minimizer import create_implicants, minimize_expression, cube_order
+
+
+@dataclass(frozen=True)
+class NpnTransform:
+    """Maps a function f onto its class representative g.
+
+    g(y) = output_negated ^ f(x), where x bit permutation[k] equals
+    y bit k xor input_negations bit permutation[k]. Bits are truth table row
+    index bits, so bit 0 is the last variable.
+    """
+    output_negated: bool
+    input_negations: int
+    permutation: tuple
+
+
+def shift_masks(num_vars):
+    """Packed row sets where each row index bit is 1, indexed by bit"""
+    return [variable_column(num_vars - shift - 1, num_vars) for shift in range(num_vars)]
+
+
+def flip_input(table, shift, masks, full):
+    """Truth table of f with the input at the given row index bit negated"""
+    distance = 1 << shift
+    upper = table & masks[shift]
+    return (upper >> distance) | ((table & ~masks[shift] & full) << distance)
+
+
+def swap_inputs(table, low, high, masks):
+    """Truth table of f with the inputs at two row index bits exchanged"""
+    if low == high:
+        return table
+    if low > high:
+        low, high = high, low
+    delta = (1 << high) - (1 << low)
+    moving = masks[low] & ~masks[high]
+    kept = table & ~(moving | (moving << delta))
+    return kept | ((table & moving) << delta) | ((table >> delta) & moving)
+
+
+def apply_transform(table, num_vars, transform):
+    """Truth table of the function the transform maps table onto"""
+    masks = shift_masks(num_vars)
+    full = full_mask(num_vars)
+    for shift in range(num_vars):
+        if (transform.input_negations >> shift) & 1:
+            table = flip_input(table, shift, masks, full)
+
+    where = list(range(num_vars))
+    for target, source in enumerate(transform.permutation):
+        current = where.index(source)
+        if current != target:
+            table = swap_inputs(table, current, target, masks)
+            where[current], where[target] = where[target], where[current]
+    return table ^ full if transform.output_negated else table
+
+
+def input_signatures(table, num_vars, masks):
+    """Per-input signatures that do not change when inputs are negated or renamed"""
+    ones = table.bit_count()
+    first = []
+    for shift in range(num_vars):
+        positive = (table & masks[shift]).bit_count()
+        first.append(max(positive, ones - positive))
+
+    signatures = []
+    for shift in range(num_vars):
+        quadrants = []
+        for other in range(num_vars):
+            if other == shift:
+                continue
+            both = (table & masks[shift] & masks[other]).bit_count()
+            only_shift = (table & masks[shift]).bit_count() - both
+            only_other = (table & masks[other]).bit_count() - both
+            rest = ones - both - only_shift - only_other
+            quadrants.append(tuple(sorted((both, only_shift, only_other, rest))))
+        signatures.append((first[shift], tuple(sorted(quadrants))))
+    return signatures
+
+
+def candidate_transforms(table, num_vars, output_negated, masks):
+    """Transforms consistent with the signature normalization of one output polarity"""
+    full = full_mask(num_vars)
+    if output_negated:
+        table ^= full
+    ones = table.bit_count()
+
+    fixed_negations = 0
+    free_negations = []
+    for shift in range(num_vars):
+        positive = (table & masks[shift]).bit_count()
+        if positive < ones - positive:
+            fixed_negations |= 1 << shift
+        elif positive == ones - positive and flip_input(table, shift, masks, full) != table:
+            free_negations.append(shift)
+
+    signatures = input_signatures(table, num_vars, masks)
+    groups = {}
+    for shift in range(num_vars):
+        groups.setdefault(signatures[shift], []).append(shift)
+    # Stronger signatures go to higher bits, i.e. earlier variables
+    ordered = [groups[key] for key in sorted(groups)]
+
+    for negation_choice in product((0, 1), repeat=len(free_negations)):
+        negations = fixed_negations
+        flipped = table
+        for shift in range(num_vars):
+            if (fixed_negations >> shift) & 1:
+                flipped = flip_input(flipped, shift, masks, full)
+        for shift, choice in zip(free_negations, negation_choice):
+            if choice:
+                negations |= 1 << shift
+                flipped = flip_input(flipped, shift, masks, full)
+
+        # Orders inside a group of mutually symmetric inputs give the same table
+        group_orders = []
+        for group in ordered:
+            if all(swap_inputs(flipped, group[0], other, masks) == flipped for other in group[1:]):
+                group_orders.append([tuple(group)])
+            else:
+                group_orders.append(list(permutations(group)))
+
+        for orders in product(*group_orders):
+            permutation = tuple(shift for order in orders for shift in order)
+            yield NpnTransform(output_negated, negations, permutation)
+
+
+def npn_canonical(table, num_vars):
+    """Canonical NPN representative of a packed truth table and the transform reaching it.
+
+    Only transforms that agree with polarity and cofactor signatures are tried,
+    instead of all n! * 2^(n+1) of them.
+    """
+    masks = shift_masks(num_vars)
+    size = 1 << num_vars
+    ones = table.bit_count()
+    polarities = [ones * 2 > size] if ones * 2 != size else [False, True]
+
+    best = None
+    for output_negated in polarities:
+        for transform in candidate_transforms(table, num_vars, output_negated, masks):
+            candidate = apply_transform(table, num_vars, transform)
+            if best is None or candidate < best[0]:
+                best = (candidate, transform)
+    return best
+
+
+def map_cube(value, care, transform):
+    """Express a cube of the representative g in the inputs of the original function"""
+    new_value = new_care = 0
+    for target, source in enumerate(transform.permutation):
+        if (care >> target) & 1:
+            new_care |= 1 << source
+            if ((value >> target) & 1) ^ ((transform.input_negations >> source) & 1):
+                new_value |= 1 << source
+    return new_value, new_care
+
+
+class NpnClassTable:
+    """In-process table of minimized covers of NPN class representatives"""
+
+    def __init__(self):
+        self._classes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._classes)
+
+    def minimize(self, table, variables, method='qm'):
+        """Minimized SDNF and SKNF implicants of a truth table, shared across its NPN class"""
+        variables = tuple(variables)
+        num_vars = len(variables)
+        canonical, transform = npn_canonical(table.result_column, num_vars)
+        key = (num_vars, canonical)
+        covers = self._classes.get(key)
+        if covers is None:
+            self.misses += 1
+            representative = TruthTableView(canonical, num_vars)
+            covers = []
+            for target, is_minterm in ((1, True), (0, False)):
+                terms = create_implicants(representative, variables, target)
+                minimized, _ = minimize_expression(terms, is_minterm, method)
+                covers.append([(imp.value, imp.care) for imp in minimized])
+            self._classes[key] = covers
+        else:
+            self.hits += 1
+
+        # Negating the output swaps the roles of the on-set and off-set covers
+        sop, pos = covers if not transform.output_negated else covers[::-1]
+        return tuple(
+            sorted((Implicant(*map_cube(value, care, transform), variables) for value, care in cover),
+                   key=cube_order)
+            for cover in (sop, pos)
+        )
+
+
+DEFAULT_CLASSES = NpnClassTable()
+
+
+def minimize_npn(table, variables, classes=DEFAULT_CLASSES, method='qm'):
+    """Minimize through the NPN class table so renamed or negated variants share the work"""
+    return classes.minimize(table, variables, method)
@@ -0,0 +1,96 @@
+# parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from expression_processor import TruthTableView, generate_truth_table, iter_result_chunks
+
+# Below this many term comparisons a process pool costs more than it saves
+MIN_PARALLEL_PAIRS = 200_000
+
+
+def resolve_workers(workers):
+    """Number of worker processes for a workers= argument; None means one per CPU"""
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return workers
+
+
+def split_range(count, parts):
+    """Split range(count) into at most parts contiguous ranges of near-equal size"""
+    parts = max(1, min(parts, count))
+    bounds = [count * k // parts for k in range(parts + 1)]
+    return [range(bounds[k], bounds[k + 1]) for k in range(parts)]
+
+
+def _table_worker(name, expr, vars, chunk_vars, chunks):
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        for first_row, row_count, packed in iter_result_chunks(expr, vars, chunk_vars, chunks):
+            offset = first_row >> 3
+            memory.buf[offset:offset + (row_count >> 3)] = packed.to_bytes(row_count >> 3, 'little')
+    finally:
+        memory.close()
+
+
+def parallel_truth_table(expr, vars, workers=None, chunk_vars=16):
+    """generate_truth_table with row ranges evaluated by worker processes.
+
+    Each worker writes its chunks straight into a shared memory buffer at
+    their row offsets, so the result does not depend on the worker count.
+    """
+    workers = resolve_workers(workers)
+    num_vars = len(vars)
+    if workers == 1 or num_vars < 3:
+        # Chunks are written as whole bytes, so tables under 8 rows stay serial
+        return generate_truth_table(expr, vars)
+    chunk_vars = max(3, min(chunk_vars, num_vars))
+    num_chunks = 1 << (num_vars - chunk_vars)
+    if num_chunks == 1:
+        return generate_truth_table(expr, vars)
+
+    size = (1 << num_vars) >> 3
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_table_worker, memory.name, list(expr), list(vars), chunk_vars, chunks)
+                       for chunks in split_range(num_chunks, workers)]
+            for future in futures:
+                future.result()
+        result = int.from_bytes(memory.buf[:size], 'little')
+    finally:
+        memory.close()
+        memory.unlink()
+    return TruthTableView(result, num_vars)
+
+
+def combine_pair(group, upper):
+    """(i, j, diff) for every term i of group that combines with term j of upper.
+
+    Both lists hold the values of terms with one common care mask, upper
+    having one more 1 bit, as in a Quine-McCluskey round.
+    """
+    pairs = []
+    for i, value1 in enumerate(group):
+        for j, value2 in enumerate(upper):
+            diff = value1 ^ value2
+            if diff and not diff & (diff - 1):
+                pairs.append((i, j, diff))
+    return pairs
+
+
+def _combine_batch(tasks):
+    return [combine_pair(group, upper) for group, upper in tasks]
+
+
+def combine_groups(tasks, workers=1):
+    """combine_pair over (group, upper) tasks, results in task order"""
+    workers = resolve_workers(workers)
+    work = sum(len(group) * len(upper) for group, upper in tasks)
+    if workers == 1 or len(tasks) < 2 or work < MIN_PARALLEL_PAIRS:
+        return _combine_batch(tasks)
+    batches = [tasks[part.start:part.stop] for part in split_range(len(tasks), workers)]
+    with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+        return [pairs for batch in pool.map(_combine_batch, batches) for pairs in batch]
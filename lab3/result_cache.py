@@ -0,0 +1,157 @@
+# result_cache.py
+import json
+import sqlite3
+from collections import OrderedDict
+
+from expression_parser import parse_postfix
+from expression_processor import generate_truth_table, function_index
+from implicant import Implicant
+from logic_minimizer import create_implicants, minimize_expression
+
+
+class ResultCache:
+    """LRU cache of minimized covers keyed by (method, variable count, truth table index).
+
+    Covers are stored as (value, care) mask pairs, independent of variable names,
+    so any expression computing the same function reuses the entry. An optional
+    sqlite file keeps entries across runs.
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(results)")]
+            if columns and 'method' not in columns:
+                # Files written before the method was part of the key cannot tell qm and espresso apart
+                self._db.execute("DROP TABLE results")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "method TEXT, num_vars INTEGER, function_index TEXT, covers TEXT, "
+                "PRIMARY KEY (method, num_vars, function_index))"
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or self._load(key) is not None
+
+    def get(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        value = self._load(key)
+        if value is not None:
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self._db is not None:
+            method, num_vars, index = key
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (method, num_vars, format(index, 'x'), json.dumps(value)),
+            )
+            self._db.commit()
+
+    def evict(self, key):
+        """Drop one entry from memory; returns whether it was there"""
+        if self._entries.pop(key, None) is None:
+            return False
+        self.evictions += 1
+        return True
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        self._shrink()
+
+    def clear(self, disk=False):
+        self._entries.clear()
+        if disk and self._db is not None:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._shrink()
+
+    def _shrink(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key):
+        if self._db is None:
+            return None
+        method, num_vars, index = key
+        row = self._db.execute(
+            "SELECT covers FROM results WHERE method = ? AND num_vars = ? AND function_index = ?",
+            (method, num_vars, format(index, 'x')),
+        ).fetchone()
+        if row is None:
+            return None
+        return [[tuple(cube) for cube in cover] for cover in json.loads(row[0])]
+
+
+DEFAULT_CACHE = ResultCache()
+
+
+def minimize_function(table, variables, cache=DEFAULT_CACHE, method='qm', minimize=None):
+    """Minimized SDNF and SKNF implicants of a truth table, reused across equivalent expressions.
+
+    On a miss minimize() supplies the two covers if given, so a caller that
+    already ran the minimization for its report does not run it again.
+    """
+    variables = tuple(variables)
+    key = (method, len(variables), function_index(table.result_column, len(variables)))
+    covers = cache.get(key) if cache is not None else None
+    if covers is None:
+        if minimize is None:
+            minimized = [minimize_expression(create_implicants(table, variables, target), is_minterm, method)[0]
+                         for target, is_minterm in ((1, True), (0, False))]
+        else:
+            minimized = minimize()
+        covers = [[(imp.value, imp.care) for imp in cover] for cover in minimized]
+        if cache is not None:
+            cache.put(key, covers)
+    return tuple([Implicant(value, care, variables) for value, care in cover] for cover in covers)
+
+
+def minimize_cached(expression, cache=DEFAULT_CACHE, method='qm'):
+    """Parse, evaluate and minimize an expression through the result cache"""
+    variables, postfix = parse_postfix(expression)
+    table = generate_truth_table(postfix, variables)
+    sdnf, sknf = minimize_function(table, variables, cache, method)
+    return variables, sdnf, sknf
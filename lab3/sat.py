@@ -0,0 +1,377 @@
+# sat.py
+import heapq
+from dataclasses import dataclass, field
+
+from expression_parser import BINARY_OPERATORS, CONSTANTS
+
+RESTART_BASE = 100
+ACTIVITY_DECAY = 0.95
+ACTIVITY_LIMIT = 1e100
+LEARNT_MINIMUM = 2000
+LEARNT_GROWTH = 1.1
+
+
+@dataclass
+class CnfFormula:
+    """Clauses over DIMACS-style literals; variables maps names to positive literals"""
+    clauses: list = field(default_factory=list)
+    num_vars: int = 0
+    variables: dict = field(default_factory=dict)
+    roots: list = field(default_factory=list)
+
+
+def tseitin_encode(exprs, variables=()):
+    """Tseitin CNF of several postfix expressions sharing gate variables.
+
+    Each expression gets a root literal that is true exactly when the
+    expression is. OR and implication are rewritten as negated AND and
+    equivalence inputs are normalized to positive literals, so De Morgan
+    variants of a subexpression hash to the same gate.
+    """
+    cnf = CnfFormula()
+    for name in variables:
+        cnf.num_vars += 1
+        cnf.variables[name] = cnf.num_vars
+    gates = {}
+
+    def gate(op, a, b):
+        if op == '|':
+            return -gate('&', -a, -b)
+        if op == '->':
+            return -gate('&', a, -b)
+        if op == 'nand':
+            return -gate('&', a, b)
+        if op == 'nor':
+            return gate('&', -a, -b)
+        if op == '^':
+            return -gate('~', a, b)
+        sign = 1
+        if op == '~':
+            if (a < 0) != (b < 0):
+                sign = -1
+            a, b = abs(a), abs(b)
+            if a == b:
+                return sign * gate_true()
+        elif a == b:
+            return a
+        elif a == -b:
+            return -gate_true()
+        if a > b:
+            a, b = b, a
+        key = (op, a, b)
+        g = gates.get(key)
+        if g is None:
+            cnf.num_vars += 1
+            g = gates[key] = cnf.num_vars
+            if op == '&':
+                cnf.clauses += [[-g, a], [-g, b], [g, -a, -b]]
+            else:
+                cnf.clauses += [[-g, -a, b], [-g, a, -b], [g, a, b], [g, -a, -b]]
+        return sign * g
+
+    def gate_true():
+        g = gates.get(True)
+        if g is None:
+            cnf.num_vars += 1
+            g = gates[True] = cnf.num_vars
+            cnf.clauses.append([g])
+        return g
+
+    for expr in exprs:
+        stack = []
+        for token in expr:
+            if token == '!':
+                stack.append(-stack.pop())
+            elif token in BINARY_OPERATORS:
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(gate(token, left, right))
+            elif token in CONSTANTS:
+                stack.append(gate_true() if token == '1' else -gate_true())
+            else:
+                if token not in cnf.variables:
+                    cnf.num_vars += 1
+                    cnf.variables[token] = cnf.num_vars
+                stack.append(cnf.variables[token])
+        if len(stack) != 1:
+            raise ValueError("Malformed postfix expression")
+        cnf.roots.append(stack[0])
+    return cnf
+
+
+def luby(i):
+    """i-th element (from 1) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if (1 << k) - 1 == i:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+class SatSolver:
+    """CDCL solver with two watched literals, VSIDS, first-UIP learning and Luby restarts.
+
+    Literals are non-zero ints; the assignment is a list indexed by literal,
+    negative literals wrapping around from the end.
+    """
+
+    def __init__(self, num_vars=0):
+        self.num_vars = num_vars
+        self.clauses = []
+        self.learnts = []
+        self.watches = {}
+        self.values = [0] * (2 * num_vars + 1)
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.phase = [False] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.increment = 1.0
+        self.heap = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        self.conflicts = 0
+        self.max_learnts = max(LEARNT_MINIMUM, num_vars)
+        self.unsat = False
+        self.model = None
+
+    def add_clause(self, lits):
+        """Add a clause at decision level 0; returns False once the formula is unsatisfiable"""
+        values = self.values
+        clause = []
+        for lit in lits:
+            if values[lit] == 1 or -lit in clause:
+                return True
+            if lit not in clause and values[lit] == 0:
+                clause.append(lit)
+        if not clause:
+            self.unsat = True
+        elif len(clause) == 1:
+            self.assign(clause[0], None)
+            if self.propagate() is not None:
+                self.unsat = True
+        else:
+            self.clauses.append(clause)
+            self.watch(clause)
+        return not self.unsat
+
+    def watch(self, clause):
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def assign(self, lit, reason):
+        var = abs(lit)
+        self.values[lit] = 1
+        self.values[-lit] = -1
+        self.level[var] = len(self.trail_limits)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def propagate(self):
+        """Unit propagation over watched literals; returns a conflicting clause or None"""
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.head < len(trail):
+            false_lit = -trail[self.head]
+            self.head += 1
+            watchers = watches.get(false_lit)
+            if not watchers:
+                continue
+            kept = []
+            for position, clause in enumerate(watchers):
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if values[lit] != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches.setdefault(lit, []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == -1:
+                        kept.extend(watchers[position + 1:])
+                        watches[false_lit] = kept
+                        return clause
+                    self.assign(first, clause)
+            watches[false_lit] = kept
+        return None
+
+    def bump(self, var):
+        self.activity[var] += self.increment
+        if self.activity[var] > ACTIVITY_LIMIT:
+            self.activity = [a / ACTIVITY_LIMIT for a in self.activity]
+            self.increment /= ACTIVITY_LIMIT
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_vars + 1)
+                         if not self.values[v]]
+            heapq.heapify(self.heap)
+        elif not self.values[var]:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def analyze(self, conflict):
+        """First-UIP learnt clause and the level to jump back to"""
+        current = len(self.trail_limits)
+        seen = set()
+        learnt = [0]
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in (clause if lit is None else clause[1:]):
+                var = abs(other)
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    self.bump(var)
+                    if self.level[var] == current:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            clause = self.reason[abs(lit)]
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = -lit
+        self.increment /= ACTIVITY_DECAY
+
+        # Drop literals implied by the rest of the clause through their reason
+        minimized = [learnt[0]]
+        for other in learnt[1:]:
+            reason = self.reason[abs(other)]
+            if reason is None or any(abs(q) not in seen and self.level[abs(q)] > 0
+                                     for q in reason[1:]):
+                minimized.append(other)
+        learnt = minimized
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # The second watch must be the literal assigned last among the rest
+        deepest = max(range(1, len(learnt)), key=lambda k: self.level[abs(learnt[k])])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def backtrack(self, level):
+        if len(self.trail_limits) <= level:
+            return
+        limit = self.trail_limits[level]
+        for lit in self.trail[limit:]:
+            var = abs(lit)
+            self.phase[var] = lit > 0
+            self.values[lit] = self.values[-lit] = 0
+            self.reason[var] = None
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.head = limit
+
+    def reduce_learnts(self):
+        """Forget the longer half of the learnt clauses; called at decision level 0"""
+        self.learnts.sort(key=len)
+        self.learnts = self.learnts[:len(self.learnts) // 2]
+        self.watches = {}
+        for clause in self.clauses:
+            self.watch(clause)
+        for clause in self.learnts:
+            self.watch(clause)
+        self.max_learnts = int(self.max_learnts * LEARNT_GROWTH)
+
+    def decide(self):
+        while self.heap:
+            _, var = heapq.heappop(self.heap)
+            if not self.values[var]:
+                return var if self.phase[var] else -var
+        return None
+
+    def solve(self):
+        """True if satisfiable, leaving the model as a list of booleans indexed by variable"""
+        if self.unsat:
+            return False
+        restarts = 1
+        budget = RESTART_BASE * luby(restarts)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_limits:
+                    self.unsat = True
+                    return False
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self.watch(learnt)
+                    self.assign(learnt[0], learnt)
+                budget -= 1
+                continue
+
+            if budget <= 0:
+                restarts += 1
+                budget = RESTART_BASE * luby(restarts)
+                self.backtrack(0)
+                if len(self.learnts) > self.max_learnts:
+                    self.reduce_learnts()
+                continue
+
+            lit = self.decide()
+            if lit is None:
+                self.model = [self.values[var] > 0 for var in range(self.num_vars + 1)]
+                self.backtrack(0)
+                return True
+            self.trail_limits.append(len(self.trail))
+            self.assign(lit, None)
+
+
+def solve_cnf(cnf, extra_clauses=()):
+    """Satisfying assignment {name: 0/1} of the formula plus extra clauses, or None"""
+    solver = SatSolver(cnf.num_vars)
+    for clause in list(cnf.clauses) + list(extra_clauses):
+        if not solver.add_clause(clause):
+            return None
+    if not solver.solve():
+        return None
+    return {name: int(solver.model[var]) for name, var in cnf.variables.items()}
+
+
+def sat_satisfiable(expr, variables=()):
+    """(True, satisfying assignment) or (False, None)"""
+    cnf = tseitin_encode([expr], variables)
+    model = solve_cnf(cnf, [[cnf.roots[0]]])
+    return (True, model) if model is not None else (False, None)
+
+
+def sat_tautology(expr, variables=()):
+    """(True, None) or (False, assignment on which the expression is 0)"""
+    cnf = tseitin_encode([expr], variables)
+    model = solve_cnf(cnf, [[-cnf.roots[0]]])
+    return (True, None) if model is None else (False, model)
+
+
+def sat_equivalent(expr1, expr2, variables=()):
+    """(True, None) or (False, assignment on which the expressions differ)"""
+    cnf = tseitin_encode([expr1, expr2], variables)
+    first, second = cnf.roots
+    model = solve_cnf(cnf, [[first, second], [-first, -second]])
+    return (True, None) if model is None else (False, model)
+
+
+def sat_check_constant(expr, variables=()):
+    """1 or 0 if the postfix expression is constant, otherwise None"""
+    if not sat_satisfiable(expr, variables)[0]:
+        return 0
+    if sat_tautology(expr, variables)[0]:
+        return 1
+    return None
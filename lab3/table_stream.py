@@ -0,0 +1,67 @@
+# table_stream.py
+import argparse
+import sys
+
+from expression_parser import parse_postfix, ParseError
+from expression_processor import iter_result_chunks
+
+SEPARATORS = {'csv': ',', 'tsv': '\t'}
+
+
+def write_truth_table(expr, vars, stream, fmt='csv', label='f', chunk_vars=16):
+    """Write the truth table of a postfix expression to a text stream chunk by chunk.
+
+    fmt is 'csv' or 'tsv' for one line per row, or 'bits' for the result column
+    as a single string of 0/1 characters. Returns the number of rows written.
+    """
+    if fmt == 'bits':
+        rows = 0
+        for _, row_count, packed in iter_result_chunks(expr, vars, chunk_vars):
+            stream.write(format(packed, f'0{row_count}b')[::-1])
+            rows += row_count
+        stream.write('\n')
+        return rows
+    if fmt not in SEPARATORS:
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    sep = SEPARATORS[fmt]
+    num_vars = len(vars)
+    stream.write(sep.join(list(vars) + [label]) + '\n')
+    rows = 0
+    low_parts = None
+    for first_row, row_count, packed in iter_result_chunks(expr, vars, chunk_vars):
+        low_vars = row_count.bit_length() - 1
+        if low_parts is None:
+            # Cells of the low variables repeat in every chunk
+            low_parts = [
+                ''.join(str((offset >> shift) & 1) + sep for shift in range(low_vars - 1, -1, -1))
+                for offset in range(row_count)
+            ]
+        prefix = ''.join(str((first_row >> shift) & 1) + sep
+                         for shift in range(num_vars - 1, low_vars - 1, -1))
+        bits = format(packed, f'0{row_count}b')[::-1]
+        stream.write(''.join(f"{prefix}{low_parts[offset]}{bits[offset]}\n"
+                             for offset in range(row_count)))
+        rows += row_count
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the truth table of a logical expression")
+    parser.add_argument('expression')
+    parser.add_argument('--format', choices=['csv', 'tsv', 'bits'], default='csv')
+    parser.add_argument('--chunk-vars', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    try:
+        variables, postfix = parse_postfix(args.expression)
+    except ParseError as error:
+        parser.error(str(error))
+    if not variables:
+        parser.error("no variables found in expression")
+    write_truth_table(postfix, variables, sys.stdout, args.format,
+                      chunk_vars=args.chunk_vars)
+
+
+if __name__ == "__main__":
+    main()
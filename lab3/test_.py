@@ -1,13 +1,37 @@
 import pytest
 import helpers as hlp
-from expression_parser import tokenize_input, extract_vars, infix_to_postfix, operator_priority, valid_var
-from expression_processor import compute_operator, invert_value, compute_expression, generate_truth_table
+from expression_parser import (
+    tokenize_input, extract_vars, infix_to_postfix, operator_priority, valid_var,
+    ParseError, AstBuilder, parse_expression, parse_postfix, to_postfix, iter_nodes,
+)
+from expression_processor import (
+    compute_operator, invert_value, compute_expression, generate_truth_table,
+    full_mask, variable_column, compute_columns, TruthTableView, compile_expression, evaluate_many,
+    iter_result_chunks, iter_truth_table, function_index
+)
+from table_stream import write_truth_table
+from result_cache import ResultCache, minimize_function, minimize_cached
+from npn import npn_canonical, apply_transform, NpnTransform, NpnClassTable
+from bdd import BDD, TRUE, FALSE, check_constant, expressions_equivalent
+from sat import tseitin_encode, SatSolver, sat_satisfiable, sat_tautology, sat_equivalent, sat_check_constant
+from expression_optimizer import build_dag, optimize_expression, optimized_truth_table, SimplifyingBuilder
+import batch_eval
+import main as main_module
+from analysis import analyze, join_form
+from logic_minimizer import StepLog
+import parallel
+from var_order import optimize_variable_order, optimize_shared_order, syntax_order, build_diagram
 from logic_minimizer import (
     create_minterms, sort_term, terms_equal, can_combine, combine_terms,
     format_term, format_term_compact, merge_terms, is_covered, build_coverage_matrix,
     quine_mccluskey, select_prime_implicants, minimize_expression, minimize_with_table,
-    get_kmap_dimensions, gray_code, create_karnaugh_map, minimize_with_kmap, remove_duplicates, contains_term
+    get_kmap_dimensions, gray_code, create_karnaugh_map, minimize_with_kmap, remove_duplicates, contains_term,
+    create_implicants, solve_prime_cover, resolve_dont_cares, kmap_minimize
 )
+from implicant import Implicant, implicants_from_terms, terms_from_implicants
+from espresso import espresso, espresso_cover, cube_mask, cover_mask
+from cover_solver import solve_cover, greedy_cover
+from multi_output import minimize_multi_output, tagged_prime_implicants
 from prettytable import PrettyTable
 
 
@@ -18,6 +42,15 @@ def test_string_length():
     assert hlp.string_length("a" * 1000) == 1000
 
 
+def test_helpers_without_size_limits():
+    assert hlp.string_length("a" * 5000) == 5000
+    assert hlp.list_size([0] * 20000) == 20000
+    lst = [1]
+    assert hlp.add_item(lst, 2) is lst
+    assert hlp.sort_list(list(range(3000, 0, -1)))[:3] == [1, 2, 3]
+    assert tokenize_input("a & " * 600 + "b")[-1] == 'b'
+
+
 def test_get_char():
     s = "test"
     assert hlp.get_char(s, 0) == 't'
@@ -124,6 +157,63 @@ def test_infix_to_postfix():
     assert infix_to_postfix(['(', 'a', '|', 'b', ')', '&', 'c']) == ['a', 'b', '|', 'c', '&']
 
 
+def test_parse_multi_character_names_and_constants():
+    variables, postfix = parse_postfix("req_valid_3 & !ack | 0 -> grant_1 ~ 1")
+    assert variables == ['ack', 'grant_1', 'req_valid_3']
+    assert postfix == ['req_valid_3', 'ack', '!', '&', '0', '|', 'grant_1', '->', '1', '~']
+    assert tokenize_input("a xor b nand c ↓ d") == ['a', '^', 'b', 'nand', 'c', 'nor', 'd']
+    assert valid_var('req_valid_3') and not valid_var('xor') and not valid_var('3a')
+    assert infix_to_postfix(tokenize_input("!!a & b")) == ['a', '!', '!', 'b', '&']
+
+
+def test_parse_new_operators_evaluate_everywhere():
+    text = "a ^ b nand c nor (d xor e) | f & 1"
+    variables, postfix = parse_postfix(text)
+    assert len(variables) == 6
+    table = generate_truth_table(postfix, variables)
+    compiled = compile_expression(postfix, variables)
+    manager = BDD(variables)
+    assert manager.satcount(manager.from_postfix(postfix)) == table.count_ones()
+    for combo, result in table:
+        values = dict(zip(variables, combo))
+        assert compute_expression(postfix, values) == result
+        assert compiled(*combo) == result
+    assert sat_equivalent(*(parse_postfix(e)[1] for e in ("a nand b", "!(a & b)")))[0]
+    assert sat_equivalent(*(parse_postfix(e)[1] for e in ("a nor b", "!a & !b")))[0]
+
+
+def test_parse_errors_report_positions():
+    cases = [("a & $", 4), ("a & (b | c", 10), ("a & & b", 4), ("a b", 2), ("a - b", 2), ("", 0), ("12", 0)]
+    for text, position in cases:
+        with pytest.raises(ParseError) as info:
+            parse_expression(text)
+        assert info.value.position == position
+
+
+def test_parse_hash_conses_shared_subexpressions():
+    builder = AstBuilder()
+    root = parse_expression("(a & b | c) -> (a & b | c) & !(a & b)", builder)
+    left, right = root.children
+    assert right.children[0] is left
+    assert right.children[1].children[0] is left.children[0]
+    assert len(iter_nodes(root)) == len(builder) == 8
+    with pytest.raises(AttributeError):
+        root.op = '&'
+
+
+def test_parse_large_expression_linear():
+    names = [f"sig_{i}" for i in range(1000)]
+    chain = " & ".join(f"({names[i % 1000]} | !{names[(i * 7) % 1000]})" for i in range(4000))
+    root = parse_expression(chain)
+    assert len(to_postfix(root)) == 4000 * 5 - 1
+    # Hash-consing keeps one node per distinct subformula: variables, negations, ORs and the AND spine
+    assert len(iter_nodes(root)) <= 1000 + 1000 + 4000 + 3999
+
+    # A chain of one operator is parsed in a loop, not one Python frame per operator
+    implications = parse_expression(" -> ".join(names * 5))
+    assert len(to_postfix(implications)) == 5000 * 2 - 1
+
+
 # Тесты для expression_processor.py
 def test_compute_operator():
     assert compute_operator('&', 1, 1) == 1
@@ -173,6 +263,97 @@ def test_generate_truth_table():
     assert len(table) == 2
 
 
+def test_compile_expression():
+    expr = infix_to_postfix(tokenize_input("(a -> b) ~ !(c | a)"))
+    vars = ['a', 'b', 'c']
+    compiled = compile_expression(expr, vars)
+    for i in range(8):
+        combo = [(i >> (2 - j)) & 1 for j in range(3)]
+        assert compiled(*combo) == compute_expression(expr, dict(zip(vars, combo)))
+    assert compile_expression(list(expr), list(vars)) is compiled
+
+
+def test_compile_expression_errors():
+    with pytest.raises(ValueError):
+        compile_expression(['a', '&'], ['a'])
+    with pytest.raises(ValueError):
+        compile_expression(['a', 'b'], ['a', 'b'])
+    with pytest.raises(ValueError):
+        compile_expression(['x'], ['a'])
+    with pytest.raises(ValueError, match="Cannot compile token: !"):
+        compile_expression(['!'], ['a'])
+
+
+def test_evaluate_many():
+    expr = ['a', 'b', '|']
+    assert evaluate_many(expr, ['a', 'b'], [(0, 0), (0, 1), (1, 0)]) == [0, 1, 1]
+    deep = ['a'] + ['a', '&'] * 5000
+    assert evaluate_many(deep, ['a'], [(1,), (0,)]) == [1, 0]
+
+
+def test_variable_column():
+    assert full_mask(2) == 0b1111
+    assert variable_column(0, 2) == 0b1100
+    assert variable_column(1, 2) == 0b1010
+    assert variable_column(0, 1) == 0b10
+
+
+def test_compute_columns_matches_rows():
+    expr = infix_to_postfix(tokenize_input("(a -> b) ~ !(c | d) & e"))
+    vars = ['a', 'b', 'c', 'd', 'e']
+    columns = {var: variable_column(i, 5) for i, var in enumerate(vars)}
+    packed = compute_columns(expr, columns, full_mask(5))
+    for i in range(32):
+        combo = [(i >> (4 - j)) & 1 for j in range(5)]
+        assert (packed >> i) & 1 == compute_expression(expr, dict(zip(vars, combo)))
+
+
+def test_truth_table_view():
+    table = generate_truth_table(['a', 'b', '->'], ['a', 'b'])
+    assert isinstance(table, TruthTableView)
+    assert list(table) == [([0, 0], 1), ([0, 1], 1), ([1, 0], 0), ([1, 1], 1)]
+    assert table[2] == ([1, 0], 0)
+    assert table[-1] == ([1, 1], 1)
+    assert table[1:3] == [([0, 1], 1), ([1, 0], 0)]
+    assert table.count_ones() == 3
+    with pytest.raises(IndexError):
+        table[4]
+
+
+def test_truth_table_many_vars():
+    vars = [chr(ord('a') + i) for i in range(20)]
+    expr = infix_to_postfix(tokenize_input(" & ".join(vars)))
+    table = generate_truth_table(expr, vars)
+    assert len(table) == 1 << 20
+    assert table.result_column == 1 << ((1 << 20) - 1)
+
+
+def test_iter_truth_table_matches_table():
+    expr = infix_to_postfix(tokenize_input("(a -> b) & c | !d ~ e"))
+    vars = ['a', 'b', 'c', 'd', 'e']
+    expected = list(generate_truth_table(expr, vars))
+    assert list(iter_truth_table(expr, vars, chunk_vars=2)) == expected
+    assert list(iter_truth_table(expr, vars, chunk_vars=16)) == expected
+    chunks = list(iter_result_chunks(expr, vars, chunk_vars=3))
+    assert [(first, count) for first, count, _ in chunks] == [(0, 8), (8, 8), (16, 8), (24, 8)]
+
+
+def test_write_truth_table_formats():
+    import io
+    expr = ['a', 'b', '->']
+    out = io.StringIO()
+    assert write_truth_table(expr, ['a', 'b'], out, 'csv', chunk_vars=1) == 4
+    assert out.getvalue() == "a,b,f\n0,0,1\n0,1,1\n1,0,0\n1,1,1\n"
+    out = io.StringIO()
+    write_truth_table(expr, ['a', 'b'], out, 'tsv', label='a->b')
+    assert out.getvalue().splitlines()[0] == "a\tb\ta->b"
+    out = io.StringIO()
+    write_truth_table(expr, ['a', 'b'], out, 'bits', chunk_vars=1)
+    assert out.getvalue() == "1101\n"
+    with pytest.raises(ValueError):
+        write_truth_table(expr, ['a', 'b'], out, 'xml')
+
+
 # Тесты для logic_minimizer.py
 def test_create_minterms():
     table = [
@@ -348,6 +529,701 @@ def test_minimize_with_kmap():
     assert kmap is not None
 
 
+def _bcd_odd_terms():
+    variables = ('a', 'b', 'c', 'd')
+    return [Implicant.from_index(i, variables).to_term() for i in (1, 3, 5, 7, 9)]
+
+
+def test_resolve_dont_cares():
+    variables = ['a', 'b', 'c', 'd']
+    by_index = resolve_dont_cares(range(10, 16), variables)
+    by_expression = resolve_dont_cares("!(a & b) & !(a & c)", variables)
+    assert [imp.value for imp in by_index] == list(range(10, 16))
+    assert by_expression == by_index
+    assert resolve_dont_cares([[('a', 1), ('b', 1)]], variables) == by_index[2:]
+    assert resolve_dont_cares(None, variables) == []
+    with pytest.raises(ValueError):
+        resolve_dont_cares([16], variables)
+    with pytest.raises(ValueError):
+        resolve_dont_cares("a & e", variables)
+
+
+def test_minimize_expression_dont_cares():
+    terms = _bcd_odd_terms()
+    minimized, _ = minimize_expression(terms, True)
+    assert len(minimized) == 2
+    for method in ('qm', 'espresso'):
+        minimized, _ = minimize_expression(terms, True, method=method, dont_cares=range(10, 16))
+        assert minimized == [[('d', 1)]]
+
+
+def test_minimize_with_table_dont_cares():
+    terms = _bcd_odd_terms()
+    minimized, steps, table = minimize_with_table(terms, True, terms, dont_cares="!(a & b) & !(a & c)")
+    assert minimized == [[('d', 1)]]
+    assert table[0] == ["Term", "d"]
+    assert len(table) == len(terms) + 1
+
+
+def test_kmap_six_variables_and_groups():
+    variables = tuple("abcdef")
+    table = generate_truth_table(_postfix("a & !c | b & d & f | !a & !b & !e"), list(variables))
+    minterms = create_implicants(table, variables, 1)
+    kmap, params = create_karnaugh_map(minterms, variables, True)
+    assert len(kmap) == 8 and len(kmap[0]) == 8
+    assert sum(row.count(1) for row in kmap) == table.count_ones()
+    # Row 0b011, column 0b010 sit at Gray positions 2 and 3
+    assert kmap[2][3] == table[0b011010][1]
+
+    minimized, steps, _ = minimize_with_kmap(minterms, True, variables)
+    assert len(minimized) == len(steps) == 3
+    covered = 0
+    for imp in minimized:
+        covered |= sum(1 << index for index in imp.minterms())
+    assert covered == table.result_column
+    assert sorted(imp.num_literals() for imp in minimized) == [2, 3, 3]
+    assert gray_code(3) == ['000', '001', '011', '010', '110', '111', '101', '100']
+
+
+def test_kmap_and_qm_list_cubes_in_the_same_order():
+    import random
+    result = analyze("a & b & c & d", cache=None)
+    assert join_form(result.sknf_kmap[0], False) == result.sknf_minimized == "(a) ∧ (b) ∧ (c) ∧ (d)"
+    rng = random.Random(4)
+    for _ in range(30):
+        table = TruthTableView(rng.getrandbits(16), 4)
+        terms = create_implicants(table, tuple("abcd"), 0)
+        minimized, _ = minimize_expression(terms, False)
+        kmap_terms, _ = kmap_minimize(terms, False, "abcd")
+        if set(kmap_terms) == set(minimized):
+            assert kmap_terms == minimized
+
+
+def test_create_karnaugh_map_dont_cares():
+    kmap, _ = create_karnaugh_map([[('a', 0), ('b', 0)]], ['a', 'b'], True, dont_cares=[0, 3])
+    assert kmap == [[1, 0], [0, "X"]]
+    minimized, _, _ = minimize_with_kmap([[('a', 0), ('b', 0)]], True, ['a', 'b'], dont_cares=[1])
+    assert minimized == [[('a', 0)]]
+
+
+# Тесты для implicant.py
+def test_implicant_roundtrip():
+    variables = ('a', 'b', 'c')
+    imp = Implicant.from_term([('c', 1), ('a', 0)], variables)
+    assert (imp.value, imp.care) == (0b001, 0b101)
+    assert imp.pattern() == "0-1"
+    assert imp.to_term() == [('a', 0), ('c', 1)]
+    assert list(imp.minterms()) == [1, 3]
+    assert imp.num_literals() == 2
+    assert imp == Implicant(0b011, 0b101, variables)
+    assert len({imp, Implicant(0b001, 0b101, variables)}) == 1
+    terms = [[('a', 1), ('b', 0)], [('b', 1)]]
+    assert terms_from_implicants(implicants_from_terms(terms)) == terms
+
+
+def test_implicant_combine_and_cover():
+    variables = ('a', 'b')
+    t1 = Implicant.from_index(0b10, variables)
+    t2 = Implicant.from_index(0b11, variables)
+    diff = t1.difference(t2)
+    assert diff == 0b01
+    combined = t1.combine(diff)
+    assert combined.to_term() == [('a', 1)]
+    assert combined.covers(t1) and combined.covers(t2)
+    assert not t1.covers(combined)
+    assert t1.difference(Implicant.from_index(0b01, variables)) == 0
+
+
+def _cover_column(implicants, num_vars):
+    column = 0
+    for imp in implicants:
+        column |= cube_mask(imp.value, imp.care, num_vars)
+    return column
+
+
+def test_quine_mccluskey_implicants_cover_function():
+    import random
+    variables = ['a', 'b', 'c', 'd']
+    rng = random.Random(4)
+    for _ in range(30):
+        table = TruthTableView(rng.getrandbits(16), 4)
+        minterms = create_implicants(table, variables, 1)
+        primes, steps = quine_mccluskey(minterms, True)
+        assert all(isinstance(p, Implicant) for p in primes)
+        selected = select_prime_implicants(minterms, primes)
+        assert _cover_column(selected, 4) == table.result_column
+
+
+def test_minimize_with_table_implicants():
+    variables = ('a', 'b')
+    terms = [Implicant.from_index(i, variables) for i in (0, 1, 3)]
+    minimized, steps, table = minimize_with_table(terms, True, terms)
+    assert sorted(format_term_compact(t, True) for t in minimized) == ["!a", "b"]
+    assert table[0][0] == "Term"
+    assert len(table) == 4
+
+
+# Тесты для cover_solver.py
+def test_solve_cover_small():
+    columns = [0b0011, 0b0110, 0b1100, 0b1001, 0b0101]
+    solution = solve_cover(columns, 0b1111)
+    assert solution.optimal
+    assert solution.cost == 2
+    covered = 0
+    for j in solution.selected:
+        covered |= columns[j]
+    assert covered == 0b1111
+
+
+def test_solve_cover_weights_and_budget():
+    columns = [0b111, 0b001, 0b010, 0b100]
+    assert solve_cover(columns, 0b111, [5, 1, 1, 1]).selected == [1, 2, 3]
+    assert solve_cover(columns, 0b111, [2, 1, 1, 1]).selected == [0]
+    fallback = solve_cover(columns, 0b111, [5, 1, 1, 1], time_budget=-1)
+    assert not fallback.optimal
+    assert fallback.selected == sorted(greedy_cover(columns, 0b111, [5, 1, 1, 1]))
+    with pytest.raises(ValueError):
+        solve_cover([0b01], 0b11)
+
+
+def test_solve_prime_cover_cyclic():
+    variables = ('a', 'b', 'c')
+    minterms = [Implicant.from_index(i, variables) for i in (0, 1, 2, 5, 6, 7)]
+    primes, _ = quine_mccluskey(minterms, True)
+    assert len(primes) == 6
+    solution = solve_prime_cover(minterms, primes)
+    assert solution.optimal
+    assert solution.cost == 3
+    assert solution.literals == 6
+    assert _cover_column(solution.selected, 3) == 0b11100111
+
+
+def test_solve_prime_cover_is_minimal():
+    import itertools
+    import random
+    rng = random.Random(11)
+    variables = tuple('abcd')
+    for _ in range(25):
+        on_set = rng.getrandbits(16)
+        if not on_set:
+            continue
+        minterms = [Implicant.from_index(i, variables) for i in range(16) if (on_set >> i) & 1]
+        primes, _ = quine_mccluskey(minterms, True)
+        solution = solve_prime_cover(minterms, primes)
+        assert _cover_column(solution.selected, 4) == on_set
+        best = next(size for size in range(1, len(primes) + 1)
+                    if any(_cover_column(combo, 4) == on_set
+                           for combo in itertools.combinations(primes, size)))
+        assert solution.cost == best
+
+
+# Тесты для espresso.py
+def test_espresso_matches_function():
+    import random
+    rng = random.Random(5)
+    variables = tuple('abcdefg')
+    for _ in range(10):
+        on_set = rng.getrandbits(1 << 7)
+        cover, steps = espresso(on_set, variables)
+        assert _cover_column(cover, 7) == on_set
+        assert steps
+
+
+def test_espresso_finds_minimal_simple_cover():
+    variables = ['a', 'b', 'c']
+    postfix = infix_to_postfix(tokenize_input("a & b | !c"))
+    table = generate_truth_table(postfix, variables)
+    cover, _ = espresso(table.result_column, variables)
+    assert sorted(format_term_compact(t, True) for t in cover) == ["!c", "ab"]
+
+
+def test_espresso_with_dont_cares():
+    variables = ('a', 'b')
+    cover, _ = espresso(0b0001, variables, dc_set=0b0100)
+    assert [format_term_compact(t, True) for t in cover] == ["!b"]
+
+
+def test_espresso_cover_input():
+    variables = ('a', 'b', 'c')
+    cover = [Implicant.from_index(i, variables) for i in (1, 3, 5, 7, 6)]
+    assert cover_mask(cover, 3) == 0b11101010
+    minimized, _ = espresso_cover(cover)
+    assert sorted(imp.pattern() for imp in minimized) == ["--1", "11-"]
+
+
+def test_minimize_expression_espresso_method():
+    terms = [
+        [('a', 0), ('b', 0)],
+        [('a', 0), ('b', 1)],
+        [('a', 1), ('b', 1)]
+    ]
+    minimized, steps = minimize_expression(terms, True, method='espresso')
+    assert sorted(minimized) == [[('a', 0)], [('b', 1)]]
+    with pytest.raises(ValueError):
+        minimize_expression(terms, True, method='unknown')
+
+
+def test_espresso_many_variables():
+    variables = [f"x{i}" for i in range(20)]
+    columns = {var: variable_column(i, 20) for i, var in enumerate(variables)}
+    postfix = ['x0', 'x1', '&', 'x2', '!', 'x3', '&', '|', 'x19', 'x5', '->', '&']
+    on_set = compute_columns(postfix, columns, full_mask(20))
+    cover, _ = espresso(on_set, variables)
+    assert _cover_column(cover, 20) == on_set
+    assert len(cover) <= 4
+
+
+# Тесты для multi_output.py
+def test_minimize_multi_output_shares_terms():
+    result = minimize_multi_output(["a & b | c", "a & b | !c & d"])
+    assert result.variables == ('a', 'b', 'c', 'd')
+    assert result.optimal
+    assert result.total_terms == 3
+    assert result.shared_terms == 1
+    assert sorted(result.format_output(0).split(" ∨ ")) == ["ab", "c"]
+    assert sorted(format_term_compact(t, True) for t in result.outputs[1]) == ["!cd", "ab"]
+
+
+def test_minimize_multi_output_covers_each_function():
+    import random
+    rng = random.Random(3)
+    variables = ('a', 'b', 'c', 'd')
+    for _ in range(10):
+        on_sets = [rng.getrandbits(16) | 1 for _ in range(3)]
+        expressions = [" | ".join(
+            " & ".join(var if (i >> (3 - p)) & 1 else "!" + var for p, var in enumerate(variables))
+            for i in range(16) if (on_set >> i) & 1) for on_set in on_sets]
+        result = minimize_multi_output(expressions, variables)
+        separate = 0
+        for on_set, cover in zip(on_sets, result.outputs):
+            assert _cover_column(cover, 4) == on_set
+            minterms = [Implicant.from_index(i, variables) for i in range(16) if (on_set >> i) & 1]
+            separate += len(minimize_expression(minterms, True)[0])
+        assert result.total_terms <= separate
+
+
+def test_tagged_prime_implicants():
+    primes = tagged_prime_implicants([0b1100, 0b1000], 2)
+    assert primes == {(0b10, 0b10): 0b01, (0b11, 0b11): 0b11}
+    with pytest.raises(ValueError):
+        minimize_multi_output(["a & b"], ['a'])
+
+
+# Тесты для result_cache.py
+def test_function_index_matches_lab2_order():
+    table = generate_truth_table(['a', 'b', '|'], ['a', 'b'])
+    assert function_index(table.result_column, 2) == 0b0111
+    table = generate_truth_table(_postfix("a & !b | c & d"), ['a', 'b', 'c', 'd'])
+    assert function_index(table.result_column, 4) == int("".join(str(result) for _, result in table), 2)
+
+
+def test_minimize_cached_reuses_equivalent_functions():
+    cache = ResultCache()
+    variables, sdnf, sknf = minimize_cached("a & b | c", cache)
+    assert sorted(format_term_compact(t, True) for t in sdnf) == ["ab", "c"]
+    assert sorted(format_term_compact(t, False) for t in sknf) == ["(a|c)", "(b|c)"]
+    variables, sdnf, _ = minimize_cached("(x & y) | !(!z)", cache)
+    assert variables == ['x', 'y', 'z']
+    assert sorted(format_term_compact(t, True) for t in sdnf) == ["xy", "z"]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_result_cache_eviction():
+    cache = ResultCache(maxsize=2)
+    for index in range(3):
+        cache.put(('qm', 2, index), [[], []])
+    assert len(cache) == 2
+    assert ('qm', 2, 0) not in cache
+    assert cache.get(('qm', 2, 0)) is None
+    assert cache.get(('qm', 2, 2)) == [[], []]
+    cache.resize(1)
+    assert len(cache) == 1 and ('qm', 2, 2) in cache
+    assert cache.evict(('qm', 2, 2)) and not cache.evict(('qm', 2, 2))
+    assert cache.stats()['evictions'] == 3
+
+
+def test_result_cache_on_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path=path)
+    table = generate_truth_table(['a', 'b', '&'], ['a', 'b'])
+    first = minimize_function(table, ['a', 'b'], cache)
+    cache.close()
+
+    reopened = ResultCache(path=path)
+    assert minimize_function(table, ['p', 'q'], reopened)[0][0].to_term() == [('p', 1), ('q', 1)]
+    assert reopened.stats()['disk_hits'] == 1
+    assert [imp.pattern() for imp in first[0]] == ["11"]
+    reopened.clear(disk=True)
+    assert ('qm', 2, 1) not in reopened
+    reopened.close()
+
+
+def test_result_cache_keys_by_method(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path=path)
+    table = generate_truth_table(['a', 'b', '&'], ['a', 'b'])
+    minimize_function(table, ['a', 'b'], cache, method='qm')
+    minimize_function(table, ['a', 'b'], cache, method='espresso')
+    assert cache.stats()['misses'] == 2 and len(cache) == 2
+    cache.close()
+    reopened = ResultCache(path=path)
+    assert ('espresso', 2, 1) in reopened and ('qm', 2, 1) in reopened
+    reopened.close()
+
+
+def test_analysis_minimizes_through_result_cache(tmp_path, capsys):
+    cache = ResultCache()
+    assert analyze("a & b | c", cache).sdnf_minimized == "ab ∨ c"
+    repeated = analyze("(x & y) | !(!z)", cache)
+    assert repeated.sknf_minimized == "(x|z) ∧ (y|z)"
+    assert "sdnf_primes" not in vars(repeated) and cache.stats()['hits'] == 1
+    path = str(tmp_path / "cache.sqlite")
+    main_module.run_program(["a -> b", "--only", "sdnf", "--cache", path])
+    assert capsys.readouterr().out.splitlines() == ["!a ∨ b"]
+    reopened = ResultCache(path=path)
+    assert ('qm', 2, 0b1101) in reopened
+    reopened.close()
+
+
+# Тесты для npn.py
+def test_npn_canonical_counts_classes():
+    assert len({npn_canonical(table, 3)[0] for table in range(256)}) == 14
+
+
+def test_npn_canonical_is_invariant():
+    import random
+    rng = random.Random(2)
+    for _ in range(30):
+        table = rng.getrandbits(16)
+        canonical, transform = npn_canonical(table, 4)
+        assert apply_transform(table, 4, transform) == canonical
+        other = NpnTransform(rng.random() < 0.5, rng.getrandbits(4), tuple(rng.sample(range(4), 4)))
+        assert npn_canonical(apply_transform(table, 4, other), 4)[0] == canonical
+
+
+def test_npn_class_table_remaps_covers():
+    classes = NpnClassTable()
+    variables = ['a', 'b', 'c']
+    full = full_mask(3)
+    for text in ("a & b | c", "!b & !a | c", "(!c & (a | b))", "!(a & c) & !(b & c) & (a | b | c)"):
+        table = generate_truth_table(infix_to_postfix(tokenize_input(text)), variables)
+        sdnf, sknf = classes.minimize(table, variables)
+        assert _cover_column(sdnf, 3) == table.result_column
+        assert _cover_column(sknf, 3) == full ^ table.result_column
+    assert (classes.hits, classes.misses) == (2, 2)
+
+
+def test_analysis_minimizes_through_npn_classes(capsys):
+    classes = NpnClassTable()
+    first = analyze("a & b | c", cache=None, classes=classes)
+    second = analyze("!b & !a | c", cache=None, classes=classes)
+    assert first.sdnf_minimized == "ab ∨ c" and second.sdnf_minimized == "!a!b ∨ c"
+    assert second.sknf_minimized == "(!a|c) ∧ (!b|c)"
+    assert (classes.hits, classes.misses) == (1, 1) and "sdnf_primes" not in vars(second)
+    main_module.run_program(["(!c & (a | b))", "--only", "sdnf", "--npn"])
+    assert capsys.readouterr().out.splitlines() == ["a!c ∨ b!c"]
+
+
+# Тесты для bdd.py
+def _postfix(text):
+    return infix_to_postfix(tokenize_input(text))
+
+
+def test_bdd_deeper_than_recursion_limit():
+    names = [f"x{i}" for i in range(3000)]
+    manager = BDD(names)
+    chain = manager.var(names[-1])
+    for name in reversed(names[:-1]):
+        chain = manager.apply('&', manager.var(name), chain)
+    either = manager.apply('|', chain, manager.var(names[-1]))
+    assert manager.satcount(chain) == 1
+    assert manager.satcount(either) == 1 << (len(names) - 1)
+    assert manager.satcount(manager.apply('^', chain, either)) == (1 << (len(names) - 1)) - 1
+
+
+def test_bdd_matches_truth_table():
+    text = "(a -> b) & (c ~ !d) | e & a"
+    variables = ['a', 'b', 'c', 'd', 'e']
+    manager = BDD(variables)
+    root = manager.from_postfix(_postfix(text))
+    table = generate_truth_table(_postfix(text), variables)
+    assert manager.satcount(root) == table.count_ones()
+    assert list(manager.iter_minterms(root)) == [i for i, row in enumerate(table) if row[1]]
+    for path in manager.iter_paths(root):
+        assert all(var in variables for var in path)
+
+
+def test_bdd_canonical_and_constants():
+    manager = BDD(['a', 'b'])
+    f = manager.from_postfix(_postfix("!(a & b)"))
+    g = manager.from_postfix(_postfix("!a | !b"))
+    assert manager.equivalent(f, g)
+    assert manager.is_tautology(manager.from_postfix(_postfix("a | !a")))
+    assert not manager.is_satisfiable(manager.from_postfix(_postfix("a & !a")))
+    assert check_constant(_postfix("a -> (b -> a)"), ['a', 'b']) == 1
+    assert check_constant(_postfix("a ~ !a"), ['a']) == 0
+    assert check_constant(_postfix("a & b"), ['a', 'b']) is None
+    assert expressions_equivalent(_postfix("a -> b"), _postfix("!a | b"))
+    assert not expressions_equivalent(_postfix("a -> b"), _postfix("b -> a"))
+
+
+def test_bdd_restrict_and_quantify():
+    manager = BDD(['a', 'b', 'c'])
+    f = manager.from_postfix(_postfix("a & b | c"))
+    assert manager.restrict(f, 'c', 1) == TRUE
+    assert manager.restrict(f, 'a', 0) == manager.var('c')
+    assert manager.exists(f, ['a', 'b']) == TRUE
+    assert manager.forall(f, ['a']) == manager.var('c')
+    assert manager.satcount(manager.exists(f, ['c'])) == 8
+    assert manager.satcount(FALSE) == 0
+
+
+def test_bdd_large_parity_stays_small():
+    variables = [f"v{i}" for i in range(60)]
+    postfix = [variables[0]]
+    for var in variables[1:]:
+        postfix += [var, '~']
+    manager = BDD(variables)
+    root = manager.from_postfix(postfix)
+    assert manager.size(root) <= 2 * 60 + 2
+    assert manager.satcount(root) == 1 << 59
+
+
+# Тесты для sat.py
+def _evaluate(postfix, assignment):
+    return evaluate_many(postfix, list(assignment), [list(assignment.values())])[0]
+
+
+def test_sat_solver_small_formulas():
+    solver = SatSolver(3)
+    for clause in ([1, 2], [-1, 3], [-2, 3], [-3, 1]):
+        assert solver.add_clause(clause)
+    assert solver.solve()
+    assert solver.model[1] and solver.model[3]
+    solver = SatSolver(2)
+    for clause in ([1, 2], [-1, 2], [1, -2], [-1, -2]):
+        solver.add_clause(clause)
+    assert not solver.solve()
+
+
+def test_sat_queries_match_bdd():
+    variables = ['a', 'b', 'c', 'd']
+    for text in ("a -> (b -> a)", "a & !a", "(a | b) & (!a | c) -> b | c", "a ~ b | c & !d"):
+        postfix = _postfix(text)
+        assert sat_check_constant(postfix, variables) == check_constant(postfix, variables)
+    holds, counterexample = sat_tautology(_postfix("a | b -> a"), ['a', 'b'])
+    assert not holds and counterexample == {'a': 0, 'b': 1}
+    assert sat_satisfiable(_postfix("a & !a"))[0] is False
+    assert sat_equivalent(_postfix("!(a & b)"), _postfix("!a | !b")) == (True, None)
+
+
+def test_sat_large_equivalence_counterexample():
+    names = [f"x{i}" for i in range(120)]
+    first = [names[0]]
+    second = [names[0], '!']
+    for i, name in enumerate(names[1:]):
+        op = '&' if i % 2 else '|'
+        first += [name, op]
+        second += [name, '!', '|' if op == '&' else '&']
+    second.append('!')
+    cnf = tseitin_encode([first, second])
+    assert cnf.roots[0] == cnf.roots[1]
+    assert sat_equivalent(first, second)[0]
+
+    broken = first[:-1] + ['->']
+    holds, assignment = sat_equivalent(first, broken)
+    assert not holds
+    assert _evaluate(first, assignment) != _evaluate(broken, assignment)
+
+
+def test_sat_equivalence_needs_search():
+    import itertools
+    names = [f"x{i}" for i in range(20)]
+    pairs = [(names[2 * i], names[2 * i + 1]) for i in range(6)]
+    rest = names[12:]
+    # Distributivity and De Morgan rewrites, which structural hashing does not merge
+    product_of_sums = " & ".join(f"({a} | {b})" for a, b in pairs)
+    sums_of_products = [" & ".join(choice) for choice in itertools.product(*pairs)]
+    first = _postfix(f"({product_of_sums}) ^ ({' & '.join(rest)})")
+    second = _postfix(f"({' | '.join(sums_of_products)}) ^ !({' | '.join('!' + name for name in rest)})")
+
+    cnf = tseitin_encode([first, second])
+    left, right = cnf.roots
+    assert left != right
+    solver = SatSolver(cnf.num_vars)
+    assert all(solver.add_clause(clause) for clause in list(cnf.clauses) + [[left, right], [-left, -right]])
+    assert not solver.solve()
+    assert solver.conflicts > 0 and solver.learnts
+    assert sat_equivalent(first, second) == (True, None)
+
+    broken = _postfix(f"({' | '.join(sums_of_products[1:])}) ^ !({' | '.join('!' + name for name in rest)})")
+    holds, assignment = sat_equivalent(first, broken)
+    assert not holds
+    assert _evaluate(first, assignment) != _evaluate(broken, assignment)
+
+
+# Тесты для expression_optimizer.py
+def test_optimizer_folds_and_rewrites():
+    assert optimize_expression(_postfix("a & 1 | 0")).format() == "return a"
+    assert optimize_expression(_postfix("!!a & (a | b)")).format() == "return a"
+    assert optimize_expression(_postfix("a & !a | b"), ['a', 'b']).format() == "return b"
+    assert optimize_expression(_postfix("(a -> a) & (b ~ b)")).format() == "t0 = 1\nreturn t0"
+    assert optimize_expression(_postfix("a ^ !a"), ['a']).evaluate({'a': 0}) == 1
+    assert build_dag(_postfix("a & b")) is not build_dag(_postfix("b & a"))
+    builder = SimplifyingBuilder()
+    assert build_dag(_postfix("a & b"), builder) is build_dag(_postfix("b & a"), builder)
+
+
+def test_optimizer_shares_repeated_subformulas():
+    sub = "(a & b | c ~ d)"
+    text = " | ".join(f"({sub} ^ x{i})" for i in range(12))
+    variables, postfix = parse_postfix(text)
+    program = optimize_expression(postfix, variables)
+    assert len(postfix) == 12 * 9 + 11
+    assert len(program) == 3 + 12 * 2 + 11
+    assert program.format().startswith("t0 = a & b")
+    expected = generate_truth_table(postfix, variables)
+    assert optimized_truth_table(postfix, variables).result_column == expected.result_column
+    compiled = program.compile()
+    for combo, result in expected:
+        assert compiled(*combo) == result
+
+
+# Тесты для batch_eval.py
+def _batch_case():
+    variables, postfix = parse_postfix("(req_a -> b) ^ c nand !d | 1 & e")
+    rows = [[(i * 37 >> k) & 1 for k in range(len(variables))] for i in range(301)]
+    expected = [compute_expression(postfix, dict(zip(variables, row))) for row in rows]
+    return variables, postfix, rows, expected
+
+
+def test_batch_numpy_matches_per_row():
+    np = pytest.importorskip("numpy")
+    variables, postfix, rows, expected = _batch_case()
+    for dtype in (np.uint8, bool):
+        result = batch_eval.evaluate_batch(postfix, variables, np.array(rows, dtype=dtype))
+        assert result.dtype == np.uint8
+        assert result.tolist() == expected
+    assert batch_eval.evaluate_batch(_postfix("a | !a"), ['a'], np.zeros((5, 1))).tolist() == [1] * 5
+    with pytest.raises(ValueError):
+        batch_eval.evaluate_batch(postfix, variables, np.zeros((3, 2)))
+
+
+def test_batch_without_numpy(monkeypatch):
+    monkeypatch.setattr(batch_eval, "np", None)
+    variables, postfix, rows, expected = _batch_case()
+    assert batch_eval.evaluate_batch(postfix, variables, rows) == expected
+    columns = batch_eval.pack_columns(rows, len(variables))
+    packed = batch_eval.evaluate_packed(postfix, variables, columns, len(rows))
+    assert [(packed >> i) & 1 for i in range(len(rows))] == expected
+
+
+# Тесты для parallel.py
+def test_parallel_truth_table_matches_serial():
+    variables, postfix = parse_postfix(" | ".join(f"(x{i} & !x{(i * 5) % 12} ^ x{(i + 3) % 12})" for i in range(12)))
+    expected = generate_truth_table(postfix, variables).result_column
+    for workers in (1, 3):
+        table = parallel.parallel_truth_table(postfix, variables, workers=workers, chunk_vars=8)
+        assert table.result_column == expected
+    assert [len(part) for part in parallel.split_range(10, 3)] == [3, 3, 4]
+    for expression in ("!a", "a ^ b", "a & b | !c"):
+        variables, postfix = parse_postfix(expression)
+        expected = generate_truth_table(postfix, variables).result_column
+        for workers in (None, 2):
+            assert parallel.parallel_truth_table(postfix, variables, workers=workers).result_column == expected
+    with pytest.raises(ValueError):
+        parallel.resolve_workers(0)
+
+
+def test_parallel_quine_mccluskey_is_deterministic(monkeypatch):
+    variables = tuple("abcdefg")
+    table = generate_truth_table(_postfix("a & b | c & !d | e ~ f | g & !a"), list(variables))
+    terms = create_implicants(table, variables, 1)
+    serial = quine_mccluskey(terms, True)
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_PAIRS", 0)
+    assert quine_mccluskey(terms, True, workers=3) == serial
+    assert minimize_expression(terms, True, workers=2)[0] == minimize_expression(terms, True)[0]
+
+
+# Тесты для analysis.py
+def test_analysis_computes_fields_on_access():
+    result = analyze("a & b | c ~ d", cache=None)
+    assert result.sdnf_minimized.count("∨") == 3
+    computed = set(vars(result))
+    assert {'truth_table', 'minterms', 'sdnf_primes', 'sdnf_terms'} <= computed
+    assert not computed & {'truth_table_display', 'sdnf_coverage', 'sdnf_kmap', 'maxterms', 'sknf'}
+
+    steps = result.sdnf_primes[1]
+    assert isinstance(steps, StepLog)
+    assert steps[0].startswith("Step 1: Combine")
+    assert steps == list(steps) and steps[:2] == list(steps)[:2]
+    assert result.sdnf_coverage[0][0] == "Term"
+    assert len(result.sdnf_kmap[0]) == len(result.sdnf_terms)
+    assert analyze("a | !a").constant == 1
+
+
+def test_main_only_sections(capsys):
+    main_module.run_program(["a & b | !c", "--only", "sdnf,sknf"])
+    assert capsys.readouterr().out.splitlines() == ["ab ∨ !c", "(a|!c) ∧ (b|!c)"]
+    main_module.run_program(["a -> b", "--only", "truth-table"])
+    out = capsys.readouterr().out
+    assert "TRUTH TABLE" in out and "KARNAUGH" not in out and "FINISHED" not in out
+    with pytest.raises(SystemExit):
+        main_module.run_program(["a", "--only", "everything"])
+
+
+def test_main_constant_prints_truth_table_first(capsys):
+    main_module.run_program(["a | !a"])
+    out = capsys.readouterr().out
+    assert out.index("TRUTH TABLE") < out.index("always TRUE")
+    assert "MINIMIZATION" not in out
+    main_module.run_program(["a | !a", "--only", "truth-table"])
+    assert "TRUTH TABLE" in capsys.readouterr().out
+
+
+# Тесты для var_order.py
+def test_sifting_finds_interleaved_order():
+    postfix = _postfix("a & d | b & e | c & f")
+    result = optimize_variable_order(postfix, ['a', 'b', 'c', 'd', 'e', 'f'])
+    assert result.initial_nodes == 14
+    assert result.final_nodes == 6
+    assert sorted(result.order) == ['a', 'b', 'c', 'd', 'e', 'f']
+    manager = BDD(result.order)
+    assert manager.size(manager.from_postfix(postfix)) == result.final_nodes + 2
+
+
+def test_swap_preserves_function():
+    postfix = _postfix("(a -> b) & (c ~ !d) | e & a")
+    variables = ['a', 'b', 'c', 'd', 'e']
+    diagram = build_diagram([postfix], variables)
+    for level in (0, 2, 1, 3, 0):
+        diagram.swap(level)
+    diagram.collect()
+    manager = BDD(diagram.order)
+    assert manager.size(manager.from_postfix(postfix)) == diagram.size() + 2
+    assert syntax_order(_postfix("c & a | b")) == ['c', 'a', 'b']
+
+
+def test_shared_order_counts_common_nodes():
+    exprs = [_postfix("a & d | b & e"), _postfix("b & e | c & f")]
+    result = optimize_shared_order(exprs, ['a', 'b', 'c', 'd', 'e', 'f'])
+    assert result.final_nodes <= result.static_nodes <= result.initial_nodes
+    manager = BDD(result.order)
+    roots = [manager.from_postfix(expr) for expr in exprs]
+    assert len({node for root in roots for node in _reachable(manager, root)}) == result.final_nodes
+
+
+def _reachable(manager, root):
+    pending, seen = [root], set()
+    while pending:
+        node = pending.pop()
+        if node > TRUE and node not in seen:
+            seen.add(node)
+            pending += [manager.low(node), manager.high(node)]
+    return seen
+
+
 # Интеграционные тесты
 def test_full_workflow():
     tokens = tokenize_input("a & b")
@@ -375,10 +1251,11 @@ def test_get_kmap_dimensions():
     assert get_kmap_dimensions(3) == (2, 4, 1, 2)  # 3 переменные: 2 строки, 4 столбца
     assert get_kmap_dimensions(4) == (4, 4, 2, 2)  # 4 переменные: 4 строки, 4 столбца
     assert get_kmap_dimensions(5) == (4, 8, 2, 3)  # 5 переменных: 4 строки, 8 столбцов
+    assert get_kmap_dimensions(6) == (8, 8, 3, 3)  # 6 переменных: 8 строк, 8 столбцов
 
     # Тестируем неподдерживаемые размерности
     assert get_kmap_dimensions(0) == (None, None, None, None)  # 0 переменных
-    assert get_kmap_dimensions(6) == (None, None, None, None)  # 6 переменных (не поддерживается)
+    assert get_kmap_dimensions(7) == (None, None, None, None)  # 7 переменных (не поддерживается)
 
     # Проверяем, что возвращаемые значения - кортежи из 4 элементов
     assert len(get_kmap_dimensions(1)) == 4
@@ -0,0 +1,208 @@
+# var_order.py
+from dataclasses import dataclass
+
+from bdd import BDD
+from expression_parser import BINARY_OPERATORS, CONSTANTS
+
+
+@dataclass
+class VariableOrderResult:
+    """Chosen variable order and decision diagram node counts before and after"""
+    order: list
+    initial_order: list
+    initial_nodes: int
+    static_nodes: int
+    final_nodes: int
+
+
+class SiftingDiagram:
+    """Shared decision diagram that can swap adjacent levels in place (Rudell's swap)"""
+
+    def __init__(self, manager, roots):
+        num_vars = len(manager.variables)
+        self.names = list(manager.variables)
+        self.level_var = list(range(num_vars))
+        self.var_level = list(range(num_vars))
+        self.var = [None, None]
+        self.low = [0, 1]
+        self.high = [0, 1]
+        self.unique = [{} for _ in range(num_vars)]
+
+        copied = {0: 0, 1: 1}
+        for root in roots:
+            pending = [root]
+            while pending:
+                node = pending[-1]
+                if node in copied:
+                    pending.pop()
+                    continue
+                low, high = manager.low(node), manager.high(node)
+                if low in copied and high in copied:
+                    pending.pop()
+                    copied[node] = self.make(manager.level(node), copied[low], copied[high])
+                else:
+                    pending.extend(child for child in (low, high) if child not in copied)
+        self.roots = [copied[root] for root in roots]
+
+    @property
+    def order(self):
+        return [self.names[var] for var in self.level_var]
+
+    def make(self, var, low, high):
+        if low == high:
+            return low
+        table = self.unique[var]
+        node = table.get((low, high))
+        if node is None:
+            node = len(self.var)
+            self.var.append(var)
+            self.low.append(low)
+            self.high.append(high)
+            table[(low, high)] = node
+        return node
+
+    def size(self):
+        """Number of internal nodes reachable from the roots"""
+        seen = set()
+        pending = [root for root in self.roots if root > 1]
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            for child in (self.low[node], self.high[node]):
+                if child > 1 and child not in seen:
+                    pending.append(child)
+        return len(seen)
+
+    def swap(self, level):
+        """Exchange the variables at level and level + 1"""
+        x = self.level_var[level]
+        y = self.level_var[level + 1]
+        for node in list(self.unique[x].values()):
+            f0, f1 = self.low[node], self.high[node]
+            if self.var[f0] != y and self.var[f1] != y:
+                continue
+            f00, f01 = (self.low[f0], self.high[f0]) if self.var[f0] == y else (f0, f0)
+            f10, f11 = (self.low[f1], self.high[f1]) if self.var[f1] == y else (f1, f1)
+            del self.unique[x][(f0, f1)]
+            new_low = self.make(x, f00, f10)
+            new_high = self.make(x, f01, f11)
+            self.var[node] = y
+            self.low[node] = new_low
+            self.high[node] = new_high
+            self.unique[y][(new_low, new_high)] = node
+
+        self.level_var[level], self.level_var[level + 1] = y, x
+        self.var_level[x], self.var_level[y] = level + 1, level
+
+    def collect(self):
+        """Drop unreachable nodes from the unique tables"""
+        seen = set()
+        pending = [root for root in self.roots if root > 1]
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            pending.extend(child for child in (self.low[node], self.high[node]) if child > 1)
+        for var, table in enumerate(self.unique):
+            self.unique[var] = {key: node for key, node in table.items() if node in seen}
+
+    def level_sizes(self):
+        return [len(table) for table in self.unique]
+
+    def sift_var(self, var, max_growth):
+        """Move one variable through every level and leave it where the diagram is smallest"""
+        num_vars = len(self.level_var)
+        best_size = self.size()
+        best_level = self.var_level[var]
+        limit = best_size * max_growth
+
+        # Visit the nearer end first, then sweep to the other end
+        start = self.var_level[var]
+        directions = [1, -1] if num_vars - 1 - start <= start else [-1, 1]
+        for direction in directions:
+            while True:
+                level = self.var_level[var]
+                target = level + direction
+                if not 0 <= target < num_vars:
+                    break
+                self.swap(min(level, target))
+                size = self.size()
+                if size < best_size:
+                    best_size, best_level = size, target
+                if size > limit:
+                    break
+
+        while self.var_level[var] < best_level:
+            self.swap(self.var_level[var])
+        while self.var_level[var] > best_level:
+            self.swap(self.var_level[var] - 1)
+        self.collect()
+        return best_size
+
+    def sift(self, max_passes=4, max_growth=1.2):
+        """Sift every variable, largest levels first, until a pass stops improving"""
+        size = self.size()
+        for _ in range(max_passes):
+            start = size
+            counts = self.level_sizes()
+            for var in sorted(range(len(counts)), key=lambda v: (-counts[v], v)):
+                size = self.sift_var(var, max_growth)
+            if size >= start:
+                break
+        return size
+
+
+def syntax_order(expr):
+    """Variables in the order a depth-first walk of the syntax tree first meets them"""
+    stack = []
+    for token in expr:
+        if token == '!':
+            continue
+        if token in CONSTANTS:
+            stack.append([])
+        elif token in BINARY_OPERATORS:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(left + [var for var in right if var not in left])
+        else:
+            stack.append([token])
+    seen = []
+    for group in stack:
+        seen += [var for var in group if var not in seen]
+    return seen
+
+
+def build_diagram(exprs, order):
+    manager = BDD(order)
+    roots = [manager.from_postfix(expr) for expr in exprs]
+    return SiftingDiagram(manager, roots)
+
+
+def optimize_shared_order(exprs, variables, max_passes=4, max_growth=1.2):
+    """Variable order minimizing the shared decision diagram of several postfix expressions"""
+    initial_order = list(variables)
+    diagram = build_diagram(exprs, initial_order)
+    initial_nodes = diagram.size()
+
+    # Static candidate from the syntax trees: first appearance in a depth-first walk
+    static_order = []
+    for expr in exprs:
+        static_order += [var for var in syntax_order(expr) if var not in static_order]
+    static_order += [var for var in initial_order if var not in static_order]
+    static_nodes = initial_nodes
+    if static_order != initial_order:
+        static = build_diagram(exprs, static_order)
+        if static.size() < initial_nodes:
+            diagram = static
+            static_nodes = static.size()
+
+    final_nodes = diagram.sift(max_passes, max_growth)
+    return VariableOrderResult(diagram.order, initial_order, initial_nodes, static_nodes, final_nodes)
+
+
+def optimize_variable_order(expr, variables, max_passes=4, max_growth=1.2):
+    """Variable order minimizing the decision diagram of a postfix expression"""
+    return optimize_shared_order([expr], variables, max_passes, max_growth)